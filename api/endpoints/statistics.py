@@ -520,7 +520,7 @@ async def get_comprehensive_channel_summary():
         overview_stats = {
             "total_text_channels": len(guild.text_channels),
             "total_messages_30d": sum(channel_message_counts.values()),
-            "total_ai_flags_30d": len([f for f in all_flags if datetime.fromisoformat(f['timestamp'].replace('Z','')) >= datetime.now() - timedelta(days=30)]),
+            "total_ai_flags_30d": logger.count_flags_since(30 * 24) if hasattr(logger, 'count_flags_since') else 0,
             "total_cases": len(all_cases),
             "total_deletions_24h": len(recent_deletions),
             "action_breakdown": [{"name": k, "value": v} for k, v in Counter(c.get("action_type", "unknown") for c in all_cases).items()],
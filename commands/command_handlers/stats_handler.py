@@ -99,7 +99,7 @@ class StatsHandler(BaseHandler):
             # Action breakdown
             action_breakdown = server_stats.get('action_breakdown', {})
             if action_breakdown:
-                action_text = "\n".join([f"**{action.title()}:** {count}" for action, count in sorted(action_breakdown.items(), key=lambda x: x[1], reverse=True)[:5]])
+                action_text = "\n".join([f"**{action.title()}:** {count}" for action, count in action_breakdown.most_common(5)])
                 embed.add_field(
                     name="⚖️ Top Actions",
                     value=action_text,
@@ -109,7 +109,7 @@ class StatsHandler(BaseHandler):
             # Top moderators
             mod_activity = server_stats.get('moderator_activity', {})
             if mod_activity:
-                mod_text = "\n".join([f"**{mod}:** {cases}" for mod, cases in list(mod_activity.items())[:5]])
+                mod_text = "\n".join([f"**{mod}:** {cases}" for mod, cases in mod_activity.most_common(5)])
                 embed.add_field(
                     name="🏆 Top Moderators",
                     value=mod_text,
@@ -184,7 +184,7 @@ class StatsHandler(BaseHandler):
             # Action breakdown
             action_breakdown = stats.get('action_breakdown', {})
             if action_breakdown:
-                action_text = "\n".join([f"**{action.title()}:** {count}" for action, count in sorted(action_breakdown.items(), key=lambda x: x[1], reverse=True)[:5]])
+                action_text = "\n".join([f"**{action.title()}:** {count}" for action, count in action_breakdown.most_common(5)])
                 embed.add_field(
                     name="⚖️ Top Actions",
                     value=action_text,
@@ -204,7 +204,7 @@ class StatsHandler(BaseHandler):
             # Top moderators
             mod_activity = stats.get('moderator_activity', {})
             if mod_activity:
-                mod_text = "\n".join([f"**{mod}:** {cases}" for mod, cases in list(mod_activity.items())[:5]])
+                mod_text = "\n".join([f"**{mod}:** {cases}" for mod, cases in mod_activity.most_common(5)])
                 embed.add_field(
                     name="🏆 Active Moderators",
                     value=mod_text,
@@ -47,12 +47,20 @@ class WatchTowerBot(commands.Bot):
         import platform
         self.ready_time = datetime.now()
         
+        if logger := self.get_dependency('logger'):
+            await logger.warmup()
+        
         guild_count = len(self.guilds)
         total_members = sum(guild.member_count for guild in self.guilds)
         
         self._print_startup_banner(platform.python_version())
         await self._print_guild_info(guild_count, total_members)
         await self._initialize_integrations()
+        
+        # Restore auto-removal deadlines for restrictions persisted before a restart
+        if psychosis_manager := self.get_dependency('psychosis_manager'):
+            await psychosis_manager.rehydrate_timers(self)
+        
         self._print_available_services()
         await self._print_config_status()
         
@@ -79,6 +87,10 @@ class WatchTowerBot(commands.Bot):
         """Clean up when bot is shutting down."""
         if self.service_check_task:
             self.service_check_task.cancel()
+        if logger := self.get_dependency('logger'):
+            await logger.flush()
+        if psychosis_manager := self.get_dependency('psychosis_manager'):
+            await psychosis_manager.flush()
         await super().close()
 
     # --------------------------------------------------------------------------
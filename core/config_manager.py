@@ -27,6 +27,7 @@ class ConfigManager:
         """Reload configuration from file"""
         try:
             self.settings.settings = self.settings.load_settings()
+            self.settings.version += 1
             return True
         except Exception:
             return False
\ No newline at end of file
@@ -17,6 +17,9 @@ class BotSettings:
         self.settings = self.load_settings()
         self.change_history = []
         
+        # Bumped on every update so consumers can invalidate derived caches
+        self.version = 0
+        
         # Load change history if it exists
         self.history_file = os.path.join(self.script_dir, "settings_history.json")
         self.load_change_history()
@@ -277,6 +280,9 @@ By proceeding, you agree to follow these rules.""",
                     }
                     self.settings[key] = new_value
             
+            if changes:
+                self.version += 1
+            
             # Update metadata
             self.settings["updated_by"] = updated_by
             
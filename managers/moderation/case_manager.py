@@ -1,16 +1,67 @@
 # managers/moderation/case_manager.py
 import os
 import json
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, List, Any
 from pathlib import Path
+from utils.json_io import read_json, write_json
+
+# Per-user case lists are cached for this long, and for at most this many users
+USER_CASES_TTL = 600
+USER_CASES_MAX = 1024
 
 class CaseManager:
-    def __init__(self, cases_dir: str, logger, message_collector=None, deleted_message_logger=None):
+    def __init__(self, cases_dir: str, logger, message_collector=None, deleted_message_logger=None,
+                 statistics_manager=None):
         self.cases_dir = cases_dir
         self.logger = logger
         self.message_collector = message_collector
         self.deleted_message_logger = deleted_message_logger
+        self.statistics_manager = statistics_manager
+        # user_id -> (loaded_at, cases sorted newest first); least recently used first.
+        # Read from worker threads as well as the event loop, so every access holds the lock.
+        self._user_cases_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Bumped by every invalidation so a load that raced one is not cached
+        self._cache_generation = 0
+        # Next case number to hand out; seeded from the case files on first use
+        self._next_case_number = None
+    
+    def get_user_cases(self, user_id: int) -> List[Dict[str, Any]]:
+        """All cases for a user, newest case number first. Treat the list as read-only."""
+        with self._cache_lock:
+            cached = self._user_cases_cache.get(user_id)
+            if cached is not None and time.monotonic() - cached[0] < USER_CASES_TTL:
+                self._user_cases_cache.move_to_end(user_id)
+                return cached[1]
+            generation = self._cache_generation
+        
+        # Files are read outside the lock so one slow user doesn't stall the others
+        cases = []
+        for case_file in Path(self.cases_dir).glob(f"case_{user_id}_*.json"):
+            try:
+                cases.append(read_json(str(case_file)))
+            except Exception as e:
+                self.logger.console_log_system(f"Error loading case file {case_file.name}: {e}", "ERROR")
+        cases.sort(key=lambda x: x.get("case_number", 0), reverse=True)
+        
+        with self._cache_lock:
+            # A case written during the read may be missing from it, so only cache a clean load
+            if self._cache_generation == generation:
+                self._user_cases_cache[user_id] = (time.monotonic(), cases)
+                self._user_cases_cache.move_to_end(user_id)
+                if len(self._user_cases_cache) > USER_CASES_MAX:
+                    self._user_cases_cache.popitem(last=False)
+        return cases
+    
+    def invalidate_user_cases(self, user_id: int):
+        """Drop the cached case list for a user"""
+        with self._cache_lock:
+            self._user_cases_cache.pop(int(user_id), None)
+            self._cache_generation += 1
     
     def get_next_case_number(self) -> int:
         """Get the next global case number by scanning the case files."""
@@ -27,10 +78,26 @@ class CaseManager:
             except (ValueError, IndexError):
                 continue
         return max_case_num + 1
+    
+    def _case_path(self, user_id: int, case_number: int) -> str:
+        """Path of a case's file"""
+        return os.path.join(self.cases_dir, f"case_{user_id}_{case_number}.json")
+    
+    def _reserve_case_number(self, user_id: int) -> int:
+        """Claim the next case number without awaiting, so concurrent creates never share one."""
+        if self._next_case_number is None:
+            self._next_case_number = self.get_next_case_number()
+        case_number = self._next_case_number
+        if os.path.exists(self._case_path(user_id, case_number)):
+            # Written outside this manager (API, another process, a restore); rescan past it
+            case_number = max(case_number + 1, self.get_next_case_number())
+        self._next_case_number = case_number + 1
+        return case_number
 
     async def create_case(self, user_id: int, action_data: Dict[str, Any], guild=None, bot=None) -> int:
         """Create a new moderation case and save it as an individual file."""
-        case_number = self.get_next_case_number()
+        # Claimed before the message collection below yields to other creates
+        case_number = self._reserve_case_number(user_id)
         
         user_avatar_url, moderator_avatar_url, user_context, guild_context = None, None, {}, {}
         
@@ -81,18 +148,27 @@ class CaseManager:
             **guild_context
         }
         
-        self._save_case_file(user_id, case_number, case_data)
+        if self._save_case_file(user_id, case_number, case_data) and self.statistics_manager:
+            self.statistics_manager.record_case(user_id, case_data)
         self.logger.console_log_system(f"Created case #{case_number} for user {user_id} in #{channel_name}", "CASE")
         
         return case_number
     
+    @staticmethod
+    def format_display_snippet(case: Dict[str, Any]) -> str:
+        """The short summary shown for a case in the moderation panel's case list."""
+        status_emoji = "🟢" if case.get("status") == "Resolved" else "🟡"
+        return (f"{status_emoji} **{(case.get('action_type') or 'Unknown').title()}** - {case.get('severity', 'Medium')}\n"
+                f"*{(case.get('reason') or 'No reason')[:60]}...*\n"
+                f"By: {case.get('moderator_name', 'Unknown')}")
+    
     def _save_case_file(self, user_id: int, case_number: int, case_data: Dict[str, Any]) -> bool:
         """Save an individual case file."""
         try:
-            filename = f"case_{user_id}_{case_number}.json"
-            filepath = os.path.join(self.cases_dir, filename)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(case_data, f, indent=2, ensure_ascii=False, default=str)
+            # Every create and update passes through here, so the snippet never goes stale
+            case_data["display_snippet"] = self.format_display_snippet(case_data)
+            write_json(self._case_path(user_id, case_number), case_data, indent=2, default=str)
+            self.invalidate_user_cases(user_id)
             return True
         except Exception as e:
             self.logger.console_log_system(f"Error saving case file: {e}", "ERROR")
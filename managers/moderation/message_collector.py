@@ -64,6 +64,7 @@ class MessageCollector:
                         'id': message.id,
                         'content': message.content,
                         'timestamp': message.created_at.isoformat(),
+                        'unix_ts': int(message.created_at.timestamp()),
                         'channel': channel.name,
                         'channel_id': channel.id,
                         'attachments': [att.url for att in message.attachments],
@@ -1,7 +1,8 @@
 # managers/moderation/moderation_manager.py
+import asyncio
 import json
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator
 from pathlib import Path
 from colorama import Fore, Style
 from core.settings import bot_settings
@@ -10,6 +11,7 @@ from .validation_manager import ValidationManager
 from .case_manager import CaseManager
 from .message_collector import MessageCollector
 from .action_executor import ActionExecutor
+from .statistics_manager import StatisticsManager, summarize_case
 
 class ModerationManager:
     def __init__(self, config, logger):
@@ -23,8 +25,14 @@ class ModerationManager:
         
         self.validator = ValidationManager(self.settings)
         self.message_collector = MessageCollector(logger)
-        self.case_manager = CaseManager(self.cases_dir, logger, self.message_collector)
+        # str(user_id) -> {"cases": [...]}, shared by the statistics manager and the report generator
+        self.user_data = self._load_user_data()
+        self.statistics_manager = StatisticsManager(self.user_data)
+        self.case_manager = CaseManager(self.cases_dir, logger, self.message_collector,
+                                        statistics_manager=self.statistics_manager)
         self.action_executor = ActionExecutor(logger)
+        # user_id -> [lock, holders and waiters]; entries exist only while a case is being created
+        self._user_locks = {}
 
     def ensure_directories(self):
         if not os.path.exists(self.cases_dir):
@@ -35,34 +43,74 @@ class ModerationManager:
         Get all cases by reading directly from the individual case files.
         This is now the single, authoritative source of truth for case data.
         """
-        all_cases = []
+        all_cases = list(self._iter_case_files())
+        all_cases.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+        return all_cases
+
+    def _iter_case_files(self) -> Iterator[Dict[str, Any]]:
+        """Yield each readable case file, one at a time."""
         cases_path = Path(self.cases_dir)
         if not cases_path.exists():
-            return []
+            return
 
         for case_file in cases_path.glob("case_*.json"):
             try:
                 with open(case_file, 'r', encoding='utf-8') as f:
-                    all_cases.append(json.load(f))
+                    yield json.load(f)
             except Exception as e:
                 self.logger.console_log_system(f"Error loading case file {case_file.name}: {e}", "ERROR")
                 continue
+
+    def _load_user_data(self) -> Dict[str, Dict[str, Any]]:
+        """Group case summaries by user for the statistics manager.
         
-        all_cases.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-        return all_cases
+        Files are read one at a time and only their summary fields are kept,
+        so memory follows the number of cases, not the evidence stored with them.
+        """
+        user_data = {}
+        for case in self._iter_case_files():
+            user_data.setdefault(str(case.get("user_id")), {"cases": []})["cases"].append(summarize_case(case))
+        return user_data
 
     async def create_moderation_case(self, user_id: int, action_data: Dict[str, Any], guild=None, bot=None) -> int:
         """Validates and creates a new moderation case via the CaseManager."""
         if not self.validator.validate_action_type(action_data.get("action_type", "")):
             raise ValueError("Invalid action type")
         
-        # The CaseManager now handles all file operations.
-        return await self.case_manager.create_case(user_id, action_data, guild, bot)
+        # Cases for the same user are created in order; different users never wait on each other
+        entry = self._user_locks.get(user_id)
+        if entry is None:
+            entry = self._user_locks[user_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                # The CaseManager now handles all file operations.
+                return await self.case_manager.create_case(user_id, action_data, guild, bot)
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._user_locks[user_id]
+
+    async def get_user_panel_snapshot(self, user_id: int, flag_hours: int = 168) -> Dict[str, Any]:
+        """Load a user's cases, statistics and recent AI flags for the moderation panel in one call."""
+        # Case files are read off the loop; stats stay on it since record_case mutates them there
+        cases = await asyncio.to_thread(self.case_manager.get_user_cases, user_id)
+        return {"cases": cases, **self.get_user_profile_summary(user_id, flag_hours)}
+
+    def get_user_profile_summary(self, user_id: int, flag_hours: int = 168) -> Dict[str, Any]:
+        """A user's statistics and recent AI flags, from memory without reading any case files."""
+        stats = self.statistics_manager.get_user_stats(user_id)
+        ai_flags = self.logger.get_user_flags(user_id, flag_hours) if self.logger else {}
+        return {"stats": stats, "ai_flags": ai_flags}
+
+    async def collect_user_messages(self, guild, user_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+        """Collect a user's recent messages via the MessageCollector."""
+        return await self.message_collector.collect_user_messages(guild, user_id, limit)
 
     def get_user_case_by_number(self, user_id: int, case_number: int) -> Dict[str, Any]:
-        """Finds a specific case by iterating through all case files."""
-        for case in self.get_all_cases():
-            if str(case.get("user_id")) == str(user_id) and case.get("case_number") == case_number:
+        """Finds a specific case among the user's (cached) case files."""
+        for case in self.case_manager.get_user_cases(user_id):
+            if case.get("case_number") == case_number:
                 return case
         return {}
 
@@ -72,5 +120,9 @@ class ModerationManager:
         if not case:
             return False
         
-        case.update(updates)
-        return self.case_manager._save_case_file(user_id, case_number, case)
\ No newline at end of file
+        # The cached dict is shared with other readers; only the saved copy carries the updates
+        case = {**case, **updates}
+        if not self.case_manager._save_case_file(user_id, case_number, case):
+            return False
+        self.statistics_manager.replace_case(user_id, case)
+        return True
\ No newline at end of file
@@ -1,55 +1,163 @@
 # managers/moderation/statistics_manager.py
 import csv
 import io
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Any, Optional, Iterator, Tuple
 from collections import Counter
 
+# Case keys exported to CSV, in column order (after user_id)
+CSV_CASE_FIELDS = (
+    'case_number', 'timestamp', 'action_type', 'reason',
+    'severity', 'moderator_name', 'status', 'duration', 'dm_sent',
+    'resolved_at', 'resolved_by', 'resolution'
+)
+
+# Case keys kept in memory for statistics, exports and reports. Evidence such as
+# recent_messages is left in the case files.
+SUMMARY_CASE_FIELDS = ('user_id', 'created_at') + CSV_CASE_FIELDS
+
+def summarize_case(case: Dict[str, Any]) -> Dict[str, Any]:
+    """The SUMMARY_CASE_FIELDS subset of a case"""
+    return {k: case[k] for k in SUMMARY_CASE_FIELDS if k in case}
+
+# Numeric weight per severity level, used for trend detection
+SEVERITY_SCORES = {
+    "Low": 1,
+    "Medium": 2,
+    "High": 3,
+    "Critical": 4
+}
+
+# Severities that count towards a user's escalation level
+HIGH_SEVERITIES = frozenset(("High", "Critical"))
+
+def _severity_score(case: Dict[str, Any]) -> int:
+    """Numeric severity of one case (unknown levels count as Medium)"""
+    return SEVERITY_SCORES.get(case.get("severity", "Medium"), 2)
+
 class StatisticsManager:
     def __init__(self, user_data: Dict[str, Any]):
         self.user_data = user_data
+        # Bumped on every recorded case so callers can tell when cached stats are stale
+        self.version = 0
+    
+    def record_case(self, user_id: int, case: Dict[str, Any]):
+        """Append a case to a user's record, keeping cached case timestamps current"""
+        case = summarize_case(case)
+        user_data = self.user_data.setdefault(str(user_id), {})
+        cases = user_data.setdefault("cases", [])
+        cache_valid = user_data.get("_ts_case_count") == len(cases)
+        if user_data.get("_sev_n") == len(cases):
+            user_data["_sev_sum"] += _severity_score(case)
+            user_data["_sev_n"] += 1
+        cases.append(case)
+        self.version += 1
+        
+        if cache_valid:
+            ts = self._case_ts(case)
+            if ts and (not user_data["first_case_ts"] or ts < user_data["first_case_ts"]):
+                user_data["first_case_ts"] = ts
+                user_data["first_case_date"] = case.get("timestamp")
+            if ts >= user_data["last_case_ts"]:
+                user_data["last_case_ts"] = ts
+                user_data["last_case_date"] = case.get("timestamp")
+            user_data["_ts_case_count"] = len(cases)
+    
+    def replace_case(self, user_id: int, case: Dict[str, Any]):
+        """Swap in the updated copy of a recorded case, matched by case number"""
+        case = summarize_case(case)
+        user_data = self.user_data.get(str(user_id), {})
+        cases = user_data.get("cases", [])
+        case_number = case.get("case_number")
+        for i, recorded in enumerate(cases):
+            if recorded.get("case_number") == case_number:
+                if user_data.get("_sev_n") == len(cases):
+                    user_data["_sev_sum"] += _severity_score(case) - _severity_score(recorded)
+                cases[i] = case
+                self.version += 1
+                return
+    
+    def _case_ts(self, case: Dict[str, Any]) -> float:
+        """Parse a case timestamp to epoch seconds (0 if missing or invalid)"""
+        try:
+            return datetime.fromisoformat(case.get("timestamp", "")).timestamp()
+        except (ValueError, TypeError):
+            return 0.0
+    
+    def _ensure_case_bounds(self, user_data: Dict[str, Any]):
+        """Compute the user's first/last case timestamps if the cached values are stale"""
+        cases = user_data.get("cases", [])
+        if user_data.get("_ts_case_count") == len(cases):
+            return
+        
+        first_ts, last_ts = 0.0, 0.0
+        first_date = last_date = None
+        for case in cases:
+            ts = self._case_ts(case)
+            if ts and (not first_ts or ts < first_ts):
+                first_ts, first_date = ts, case.get("timestamp")
+            if ts >= last_ts:
+                last_ts, last_date = ts, case.get("timestamp")
+        
+        user_data["first_case_ts"] = first_ts
+        user_data["first_case_date"] = first_date
+        user_data["last_case_ts"] = last_ts
+        user_data["last_case_date"] = last_date
+        user_data["_ts_case_count"] = len(cases)
+    
+    def _severity_totals(self, user_data: Dict[str, Any]) -> Tuple[int, int]:
+        """Running (score sum, case count) for a user, computed once and then kept by record/replace_case"""
+        cases = user_data.get("cases", [])
+        if user_data.get("_sev_n") != len(cases):
+            user_data["_sev_sum"] = sum(_severity_score(case) for case in cases)
+            user_data["_sev_n"] = len(cases)
+        return user_data["_sev_sum"], user_data["_sev_n"]
+    
+    def _last_case_ts(self, user_data: Dict[str, Any]) -> float:
+        """Timestamp of a user's most recent case, cached on the record"""
+        self._ensure_case_bounds(user_data)
+        return user_data["last_case_ts"]
     
     def get_moderation_summary(self, days: int = 30) -> Dict[str, Any]:
         """Get comprehensive moderation statistics"""
         cutoff_date = datetime.now() - timedelta(days=days)
+        cutoff_ts = cutoff_date.timestamp()
         
-        # Collect all cases in time period
-        recent_cases = []
+        # Single pass over the cases in the time period, accumulating every breakdown
+        total_cases = 0
+        open_cases = 0
+        action_counts = Counter()
+        severity_counts = Counter()
+        mod_counts = Counter()
+        daily_counts = {}
+        moderated_users = set()
         for user_id, user_data in self.user_data.items():
+            # Skip users with no activity inside the window
+            if self._last_case_ts(user_data) < cutoff_ts:
+                continue
             cases = user_data.get("cases", [])
             for case in cases:
                 try:
                     case_date = datetime.fromisoformat(case.get("timestamp", ""))
-                    if case_date >= cutoff_date:
-                        case_copy = case.copy()
-                        case_copy["user_id"] = user_id
-                        recent_cases.append(case_copy)
+                    if case_date < cutoff_date:
+                        continue
                 except (ValueError, TypeError):
                     continue
+                
+                total_cases += 1
+                if case.get("status") == "Open":
+                    open_cases += 1
+                action_counts[case.get("action_type", "unknown")] += 1
+                severity_counts[case.get("severity", "Medium")] += 1
+                mod_counts[case.get("moderator_name", "Unknown")] += 1
+                day = case_date.toordinal()
+                daily_counts[day] = daily_counts.get(day, 0) + 1
+                moderated_users.add(user_id)
         
-        # Calculate statistics
-        total_cases = len(recent_cases)
-        open_cases = len([c for c in recent_cases if c.get("status") == "Open"])
         resolved_cases = total_cases - open_cases
         
-        # Action type breakdown
-        action_counts = Counter(case.get("action_type", "unknown") for case in recent_cases)
-        
-        # Severity breakdown
-        severity_counts = Counter(case.get("severity", "Medium") for case in recent_cases)
-        
-        # Moderator activity
-        mod_activity = Counter(case.get("moderator_name", "Unknown") for case in recent_cases)
-        
-        # Daily activity
-        daily_activity = {}
-        for case in recent_cases:
-            try:
-                case_date = datetime.fromisoformat(case.get("timestamp", ""))
-                date_key = case_date.strftime("%Y-%m-%d")
-                daily_activity[date_key] = daily_activity.get(date_key, 0) + 1
-            except (ValueError, TypeError):
-                continue
+        # Daily activity - format only the distinct days, not every case
+        daily_activity = {date.fromordinal(day).isoformat(): count for day, count in daily_counts.items()}
         
         return {
             "period_days": days,
@@ -57,11 +165,11 @@ class StatisticsManager:
             "open_cases": open_cases,
             "resolved_cases": resolved_cases,
             "resolution_rate": (resolved_cases / total_cases * 100) if total_cases > 0 else 0,
-            "action_breakdown": dict(action_counts),
-            "severity_breakdown": dict(severity_counts),
-            "moderator_activity": dict(mod_activity.most_common(10)),
+            "action_breakdown": action_counts,
+            "severity_breakdown": severity_counts,
+            "moderator_activity": Counter(dict(mod_counts.most_common(10))),
             "daily_activity": daily_activity,
-            "unique_users_moderated": len(set(case.get("user_id") for case in recent_cases)),
+            "unique_users_moderated": len(moderated_users),
             "avg_cases_per_day": total_cases / days if days > 0 else 0
         }
     
@@ -84,24 +192,26 @@ class StatisticsManager:
         
         # Calculate comprehensive stats
         total_cases = len(cases)
-        open_cases = len([c for c in cases if c.get("status") == "Open"])
+        open_cases = sum(1 for c in cases if c.get("status") == "Open")
         
         action_counts = Counter(case.get("action_type", "unknown") for case in cases)
         severity_counts = Counter(case.get("severity", "Medium") for case in cases)
         
         # Recent activity (last 30 days)
         cutoff_date = datetime.now() - timedelta(days=30)
-        recent_cases = []
+        recent_count = 0
         for case in cases:
             try:
                 case_date = datetime.fromisoformat(case.get("timestamp", ""))
                 if case_date >= cutoff_date:
-                    recent_cases.append(case)
+                    recent_count += 1
             except (ValueError, TypeError):
                 continue
         
         # Escalation pattern detection
-        escalation_level = len([c for c in cases if c.get("severity") in ["High", "Critical"]])
+        escalation_level = sum(severity_counts[severity] for severity in HIGH_SEVERITIES)
+        
+        self._ensure_case_bounds(user_data)
         
         return {
             "total_cases": total_cases,
@@ -111,13 +221,13 @@ class StatisticsManager:
             "kicks": action_counts.get("kick", 0),
             "bans": action_counts.get("ban", 0),
             "mod_notes": action_counts.get("mod_note", 0),
-            "recent_cases_30d": len(recent_cases),
+            "recent_cases_30d": recent_count,
             "severity_breakdown": dict(severity_counts),
             "escalation_level": escalation_level,
-            "last_case_date": cases[-1].get("timestamp") if cases else None,
-            "first_case_date": cases[0].get("timestamp") if cases else None,
+            "last_case_date": user_data["last_case_date"],
+            "first_case_date": user_data["first_case_date"],
             "most_common_action": action_counts.most_common(1)[0][0] if action_counts else None,
-            "trend": self._calculate_trend(cases)
+            "trend": self._calculate_trend(user_data)
         }
     
     def get_moderator_stats(self, moderator_name: str, days: int = 30) -> Dict[str, Any]:
@@ -153,79 +263,69 @@ class StatisticsManager:
         }
     
     def export_cases_to_csv(self, output_file: Optional[str] = None) -> str:
-        """Export all cases to CSV format"""
-        output = io.StringIO()
-        
-        # CSV headers
-        fieldnames = [
-            'user_id', 'case_number', 'timestamp', 'action_type', 'reason',
-            'severity', 'moderator_name', 'status', 'duration', 'dm_sent',
-            'resolved_at', 'resolved_by', 'resolution'
-        ]
-        
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        # Write all cases
-        for user_id, user_data in self.user_data.items():
-            cases = user_data.get("cases", [])
-            for case in cases:
-                row = {
-                    'user_id': user_id,
-                    'case_number': case.get("case_number", ""),
-                    'timestamp': case.get("timestamp", ""),
-                    'action_type': case.get("action_type", ""),
-                    'reason': case.get("reason", ""),
-                    'severity': case.get("severity", ""),
-                    'moderator_name': case.get("moderator_name", ""),
-                    'status': case.get("status", ""),
-                    'duration': case.get("duration", ""),
-                    'dm_sent': case.get("dm_sent", ""),
-                    'resolved_at': case.get("resolved_at", ""),
-                    'resolved_by': case.get("resolved_by", ""),
-                    'resolution': case.get("resolution", "")
-                }
-                writer.writerow(row)
+        """Export all cases to CSV format.
         
-        csv_content = output.getvalue()
-        output.close()
+        When output_file is given the rows are streamed straight to disk and
+        the path is returned; otherwise the CSV content is returned.
+        """
+        header = ('user_id',) + CSV_CASE_FIELDS
         
-        # Save to file if specified
         if output_file:
             try:
                 with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                    f.write(csv_content)
+                    writer = csv.writer(f)
+                    writer.writerow(header)
+                    writer.writerows(self._iter_rows())
+                return output_file
             except Exception:
-                pass  # Ignore file save errors
+                pass  # Fall back to returning the content in memory
         
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(header)
+        writer.writerows(self._iter_rows())
+        
+        csv_content = output.getvalue()
+        output.close()
         return csv_content
     
-    def _calculate_trend(self, cases: List[Dict[str, Any]]) -> str:
+    def _iter_rows(self) -> Iterator[Tuple[Any, ...]]:
+        """Yield one CSV row tuple per case, in CSV_CASE_FIELDS order"""
+        for user_id, user_data in self.user_data.items():
+            for case in user_data.get("cases", []):
+                yield (user_id,) + tuple(case.get(k, "") for k in CSV_CASE_FIELDS)
+    
+    def _calculate_trend(self, user_data: Dict[str, Any]) -> str:
         """Calculate trend direction for a user's cases"""
+        cases = user_data.get("cases", [])
         if len(cases) < 2:
             return "insufficient_data"
         
-        # Look at recent vs older cases
+        # Score only the recent and undated cases; the older bucket is what the
+        # running totals leave over
         recent_cutoff = datetime.now() - timedelta(days=30)
-        recent_cases = []
-        older_cases = []
+        recent_sum = recent_n = undated_sum = undated_n = 0
         
         for case in cases:
             try:
                 case_date = datetime.fromisoformat(case.get("timestamp", ""))
-                if case_date >= recent_cutoff:
-                    recent_cases.append(case)
-                else:
-                    older_cases.append(case)
             except (ValueError, TypeError):
+                undated_sum += _severity_score(case)
+                undated_n += 1
                 continue
+            if case_date >= recent_cutoff:
+                recent_sum += _severity_score(case)
+                recent_n += 1
         
-        if not recent_cases or not older_cases:
+        total_sum, total_n = self._severity_totals(user_data)
+        older_sum = total_sum - recent_sum - undated_sum
+        older_n = total_n - recent_n - undated_n
+        if not recent_n or not older_n:
             return "insufficient_data"
         
         # Compare severity trends
-        recent_severity_avg = self._get_severity_score(recent_cases)
-        older_severity_avg = self._get_severity_score(older_cases)
+        recent_severity_avg = recent_sum / recent_n
+        older_severity_avg = older_sum / older_n
         
         if recent_severity_avg > older_severity_avg * 1.2:
             return "escalating"
@@ -235,20 +335,9 @@ class StatisticsManager:
             return "stable"
     
     def _get_severity_score(self, cases: List[Dict[str, Any]]) -> float:
-       """Calculate average severity score for a list of cases"""
-       if not cases:
-           return 0
-       
-       severity_scores = {
-           "Low": 1,
-           "Medium": 2,
-           "High": 3,
-           "Critical": 4
-       }
-       
-       total_score = 0
-       for case in cases:
-           severity = case.get("severity", "Medium")
-           total_score += severity_scores.get(severity, 2)
-       
-       return total_score / len(cases)
\ No newline at end of file
+        """Calculate average severity score for a list of cases"""
+        if not cases:
+            return 0
+        
+        total_score = sum(_severity_score(case) for case in cases)
+        return total_score / len(cases)
@@ -1,30 +1,46 @@
 # managers/moderation/validation_manager.py
-from typing import List
+from typing import Iterable
+
+VALID_ACTIONS = frozenset(("warn", "timeout", "kick", "ban", "mod_note", "silence"))
+VALID_SEVERITIES = frozenset(("Low", "Medium", "High", "Critical"))
 
 class ValidationManager:
     def __init__(self, settings):
         self.settings = settings
+        self._settings_version = None
+        self._mod_set = frozenset()
+        self._admin_set = frozenset()
+        self.refresh()
+    
+    def refresh(self):
+        """Rebuild the cached role sets from the current settings"""
+        admin_roles = frozenset(self.settings.get("admin_roles", []))
+        self._admin_set = admin_roles
+        self._mod_set = frozenset(self.settings.get("mod_roles", [])) | admin_roles
+        self._settings_version = getattr(self.settings, "version", None)
+    
+    def _ensure_fresh(self):
+        """Recompute the role sets if the settings have changed since the last refresh"""
+        if getattr(self.settings, "version", None) != self._settings_version:
+            self.refresh()
     
-    def user_can_moderate(self, user_roles: List[int]) -> bool:
+    def user_can_moderate(self, user_roles: Iterable[int]) -> bool:
         """Check if user has moderation permissions"""
-        mod_roles = self.settings.get("mod_roles", [])
-        admin_roles = self.settings.get("admin_roles", [])
-        return any(role_id in mod_roles + admin_roles for role_id in user_roles)
+        self._ensure_fresh()
+        return not self._mod_set.isdisjoint(user_roles)
     
-    def user_is_admin(self, user_roles: List[int]) -> bool:
+    def user_is_admin(self, user_roles: Iterable[int]) -> bool:
         """Check if user has admin permissions"""
-        admin_roles = self.settings.get("admin_roles", [])
-        return any(role_id in admin_roles for role_id in user_roles)
+        self._ensure_fresh()
+        return not self._admin_set.isdisjoint(user_roles)
     
     def validate_action_type(self, action_type: str) -> bool:
         """Validate moderation action type"""
-        valid_actions = ["warn", "timeout", "kick", "ban", "mod_note", "silence"]
-        return action_type in valid_actions
+        return action_type in VALID_ACTIONS
     
     def validate_severity(self, severity: str) -> bool:
         """Validate case severity level"""
-        valid_severities = ["Low", "Medium", "High", "Critical"]
-        return severity in valid_severities
+        return severity in VALID_SEVERITIES
     
     def validate_duration(self, duration: int, action_type: str) -> bool:
         """Validate duration for time-based actions"""
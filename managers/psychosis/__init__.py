@@ -3,12 +3,14 @@
 Psychosis management system components
 """
 
-from .restriction_manager import RestrictionManager
+from .restriction_manager import RestrictionManager, RESTRICTION_NAMES, pretty_restriction_name
 from .notification_manager import NotificationManager
 from .timer_manager import TimerManager
 
 __all__ = [
     'RestrictionManager',
     'NotificationManager', 
-    'TimerManager'
+    'TimerManager',
+    'RESTRICTION_NAMES',
+    'pretty_restriction_name'
 ]
\ No newline at end of file
@@ -1,16 +1,108 @@
 # managers/psychosis/notification_manager.py
+import asyncio
+import time
 import discord
-from datetime import datetime, timedelta
-from typing import Dict, Any
+from discord.utils import utcnow
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+from .restriction_manager import pretty_restriction_name
+
+# Fixed parts of the notification embeds. Every embed is built with Embed.from_dict
+# from a new fields list, so nothing sent ever shares state with these dicts.
+_MOD_APPLIED_EMBED = {"title": "🧠 Psychosis Restriction Applied", "color": discord.Color.orange().value}
+_MOD_ENDED_EMBED = {"title": "🧠 Psychosis Restriction Ended", "color": discord.Color.green().value}
+_USER_DM_EMBED = {
+    "title": "🧠 Mental Health Support",
+    "description": "You have been temporarily restricted to help ensure your wellbeing.",
+    "color": discord.Color.blue().value,
+}
+_USER_DM_SUPPORT_FIELD = {
+    "name": "Support Resources",
+    "value": "If you're experiencing a mental health crisis, please reach out to local emergency services or a crisis helpline.",
+    "inline": False,
+}
+_ENDED_DM_EMBED = {
+    "title": "🧠 Restriction Removed",
+    "description": "Your mental health restriction has been lifted.",
+    "color": discord.Color.green().value,
+}
+_ENDED_DM_SUPPORT_FIELD = {
+    "name": "Support",
+    "value": "If you continue to experience difficulties, please don't hesitate to reach out to our moderation team or seek professional help.",
+    "inline": False,
+}
+
+# Minimum gap between Discord sends from the notification worker (30/min)
+SEND_INTERVAL = 2.0
 
 class NotificationManager:
     def __init__(self, config_manager, logger):
         self.config = config_manager
         self.logger = logger
+        
+        # All notifications are sent in order by a single worker, spaced by SEND_INTERVAL
+        self._queue = asyncio.Queue()
+        self._worker = None
+        self._last_send = 0.0
+    
+    def _pretty_name(self, restriction_type: str) -> str:
+        """Human-readable restriction type"""
+        return pretty_restriction_name(restriction_type)
+    
+    def _enqueue(self, job: Callable[[], Awaitable[None]]):
+        """Queue a notification job and make sure the worker is running"""
+        self._queue.put_nowait(job)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._drain())
+    
+    async def _drain(self):
+        """Run queued notification jobs one at a time"""
+        while True:
+            job = await self._queue.get()
+            try:
+                await job()
+            except Exception as e:
+                self.logger.console_log_system(f"Error in notification worker: {e}", "WARNING")
+            finally:
+                self._queue.task_done()
+    
+    async def _send(self, destination, content: str = None, **kwargs):
+        """Send a message, spaced from the previous send and retried once if rate limited"""
+        delay = self._last_send + SEND_INTERVAL - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            return await destination.send(content, **kwargs)
+        except discord.HTTPException as e:
+            if e.status != 429:
+                raise
+            headers = getattr(e.response, "headers", None) or {}
+            retry_after = float(headers.get("Retry-After", SEND_INTERVAL))
+            self.logger.console_log_system(f"Notification rate limited, retrying in {retry_after:.1f}s", "WARNING")
+            await asyncio.sleep(retry_after)
+            return await destination.send(content, **kwargs)
+        finally:
+            self._last_send = time.monotonic()
     
     async def send_restriction_notifications(self, bot, guild: discord.Guild, 
                                            user: discord.Member, restriction_type: str, 
                                            restriction_data: Dict[str, Any]):
+        """Queue notifications for an applied restriction"""
+        self._enqueue(lambda: self._send_restriction_notifications(
+            bot, guild, user, restriction_type, restriction_data
+        ))
+    
+    async def send_restriction_ended_notification(self, bot, guild: discord.Guild, 
+                                                user: discord.Member, restriction_data: Dict[str, Any], 
+                                                reason: str, user_reason: Optional[str] = None):
+        """Queue notifications for an ended restriction; user_reason, if given, is what the user's DM shows"""
+        self._enqueue(lambda: self._send_restriction_ended_notification(
+            bot, guild, user, restriction_data, reason, user_reason
+        ))
+    
+    async def _send_restriction_notifications(self, bot, guild: discord.Guild, 
+                                            user: discord.Member, restriction_type: str, 
+                                            restriction_data: Dict[str, Any]):
         """Send notifications when restriction is applied"""
         try:
             # Send DM to user if user comment provided
@@ -27,9 +119,9 @@ class NotificationManager:
         except Exception as e:
             self.logger.console_log_system(f"Error sending notifications: {e}", "WARNING")
     
-    async def send_restriction_ended_notification(self, bot, guild: discord.Guild, 
-                                                user: discord.Member, restriction_data: Dict[str, Any], 
-                                                reason: str):
+    async def _send_restriction_ended_notification(self, bot, guild: discord.Guild, 
+                                                 user: discord.Member, restriction_data: Dict[str, Any], 
+                                                 reason: str, user_reason: Optional[str] = None):
         """Send notifications when restriction ends"""
         try:
             # Send mod channel notification
@@ -38,7 +130,7 @@ class NotificationManager:
             )
             
             # Send user DM if appropriate
-            await self._send_restriction_ended_user_dm(user, restriction_data, reason)
+            await self._send_restriction_ended_user_dm(user, restriction_data, user_reason or reason)
             
         except Exception as e:
             self.logger.console_log_system(f"Error sending end notifications: {e}", "WARNING")
@@ -50,38 +142,16 @@ class NotificationManager:
             user_comment = restriction_data.get("user_comment", "")
             duration = restriction_data.get("duration_minutes", 0)
             
-            embed = discord.Embed(
-                title="🧠 Mental Health Support",
-                description=f"You have been temporarily restricted to help ensure your wellbeing.",
-                color=discord.Color.blue()
-            )
-            
-            embed.add_field(
-                name="Restriction Type",
-                value=restriction_type.replace("_", " ").title(),
-                inline=True
-            )
-            
-            embed.add_field(
-                name="Duration",
-                value=f"{duration} minutes",
-                inline=True
-            )
-            
+            fields = [
+                {"name": "Restriction Type", "value": self._pretty_name(restriction_type), "inline": True},
+                {"name": "Duration", "value": f"{duration} minutes", "inline": True},
+            ]
             if user_comment:
-                embed.add_field(
-                    name="Message from Moderators",
-                    value=user_comment,
-                    inline=False
-                )
+                fields.append({"name": "Message from Moderators", "value": user_comment, "inline": False})
+            fields.append(dict(_USER_DM_SUPPORT_FIELD))
             
-            embed.add_field(
-                name="Support Resources",
-                value="If you're experiencing a mental health crisis, please reach out to local emergency services or a crisis helpline.",
-                inline=False
-            )
-            
-            await user.send(embed=embed)
+            embed = discord.Embed.from_dict({**_USER_DM_EMBED, "fields": fields})
+            await self._send(user, embed=embed)
             
         except discord.Forbidden:
             self.logger.console_log_system(f"Could not send DM to {user.display_name}", "WARNING")
@@ -100,31 +170,40 @@ class NotificationManager:
             return
         
         try:
-            duration = restriction_data.get("duration_minutes", 0)
-            moderator_name = restriction_data.get("moderator_name", "Unknown")
-            mod_comment = restriction_data.get("mod_comment", "No comment provided")
-            
-            embed = discord.Embed(
-                title="🧠 Psychosis Restriction Applied",
-                description=f"Mental health restriction has been applied to {user.display_name}",
-                color=discord.Color.orange(),
-                timestamp=datetime.now()
-            )
-            
-            embed.add_field(name="User", value=f"{user.display_name} ({user.mention})", inline=True)
-            embed.add_field(name="Restriction", value=restriction_type.replace("_", " ").title(), inline=True)
-            embed.add_field(name="Duration", value=f"{duration} minutes", inline=True)
-            embed.add_field(name="Applied By", value=moderator_name, inline=True)
-            embed.add_field(name="Expires", value=f"<t:{int((datetime.now() + timedelta(minutes=duration)).timestamp())}:F>", inline=True)
-            embed.add_field(name="Internal Notes", value=mod_comment[:1024], inline=False)
-            
-            embed.set_thumbnail(url=user.display_avatar.url)
-            
-            await mod_channel.send(embed=embed)
+            embed = self._build_mod_embed(user, restriction_type, restriction_data)
+            await self._send(mod_channel, embed=embed)
             
         except Exception as e:
             self.logger.console_log_system(f"Error sending mod notification: {e}", "WARNING")
     
+    def _build_mod_embed(self, user: discord.Member, restriction_type: str,
+                         restriction_data: Dict[str, Any]) -> discord.Embed:
+        """Build the 'restriction applied' mod embed (synchronous, no I/O)"""
+        duration = restriction_data.get("duration_minutes", 0)
+        moderator_name = restriction_data.get("moderator_name", "Unknown")
+        mod_comment = restriction_data.get("mod_comment", "No comment provided")
+        if len(mod_comment) > 1024:
+            mod_comment = mod_comment[:1024]
+        
+        now = utcnow()
+        expires_unix = int(now.timestamp()) + duration * 60
+        display_name = user.display_name
+        
+        return discord.Embed.from_dict({
+            **_MOD_APPLIED_EMBED,
+            "description": f"Mental health restriction has been applied to {display_name}",
+            "timestamp": now.isoformat(),
+            "thumbnail": {"url": user.display_avatar.url},
+            "fields": [
+                {"name": "User", "value": f"{display_name} ({user.mention})", "inline": True},
+                {"name": "Restriction", "value": self._pretty_name(restriction_type), "inline": True},
+                {"name": "Duration", "value": f"{duration} minutes", "inline": True},
+                {"name": "Applied By", "value": moderator_name, "inline": True},
+                {"name": "Expires", "value": f"<t:{expires_unix}:F>", "inline": True},
+                {"name": "Internal Notes", "value": mod_comment, "inline": False},
+            ],
+        })
+    
     async def _log_to_psychosis_channel(self, bot, guild: discord.Guild, user: discord.Member,
                                       restriction_type: str, restriction_data: Dict[str, Any]):
         """Log restriction to psychosis channel"""
@@ -139,7 +218,7 @@ class NotificationManager:
         try:
             user_comment = restriction_data.get("user_comment", "")
             if user_comment:
-                await psychosis_channel.send(f"📢 {user.mention}: {user_comment}")
+                await self._send(psychosis_channel, f"📢 {user.mention}: {user_comment}")
                 
         except Exception as e:
             self.logger.console_log_system(f"Error logging to psychosis channel: {e}", "WARNING")
@@ -161,22 +240,23 @@ class NotificationManager:
             duration = restriction_data.get("duration_minutes", 0)
             moderator_name = restriction_data.get("moderator_name", "Unknown")
             
-            embed = discord.Embed(
-                title="🧠 Psychosis Restriction Ended",
-                description=f"Mental health restriction has been removed from {user.display_name}",
-                color=discord.Color.green(),
-                timestamp=datetime.now()
-            )
+            display_name = user.display_name
             
-            embed.add_field(name="User", value=f"{user.display_name} ({user.mention})", inline=True)
-            embed.add_field(name="Restriction Type", value=restriction_type.replace("_", " ").title(), inline=True)
-            embed.add_field(name="Duration", value=f"{duration} minutes", inline=True)
-            embed.add_field(name="Originally Applied By", value=moderator_name, inline=True)
-            embed.add_field(name="End Reason", value=reason, inline=False)
+            embed = discord.Embed.from_dict({
+                **_MOD_ENDED_EMBED,
+                "description": f"Mental health restriction has been removed from {display_name}",
+                "timestamp": utcnow().isoformat(),
+                "thumbnail": {"url": user.display_avatar.url},
+                "fields": [
+                    {"name": "User", "value": f"{display_name} ({user.mention})", "inline": True},
+                    {"name": "Restriction Type", "value": self._pretty_name(restriction_type), "inline": True},
+                    {"name": "Duration", "value": f"{duration} minutes", "inline": True},
+                    {"name": "Originally Applied By", "value": moderator_name, "inline": True},
+                    {"name": "End Reason", "value": reason, "inline": False},
+                ],
+            })
             
-            embed.set_thumbnail(url=user.display_avatar.url)
-            
-            await mod_channel.send(embed=embed)
+            await self._send(mod_channel, embed=embed)
             
         except Exception as e:
             self.logger.console_log_system(f"Error sending end notification: {e}", "WARNING")
@@ -185,20 +265,15 @@ class NotificationManager:
                                             restriction_data: Dict[str, Any], reason: str):
         """Send DM to user when restriction ends"""
         try:
-            embed = discord.Embed(
-                title="🧠 Restriction Removed",
-                description="Your mental health restriction has been lifted.",
-                color=discord.Color.green()
-            )
-            
-            embed.add_field(name="Reason", value=reason, inline=False)
-            embed.add_field(
-                name="Support",
-                value="If you continue to experience difficulties, please don't hesitate to reach out to our moderation team or seek professional help.",
-                inline=False
-            )
+            embed = discord.Embed.from_dict({
+                **_ENDED_DM_EMBED,
+                "fields": [
+                    {"name": "Reason", "value": reason, "inline": False},
+                    dict(_ENDED_DM_SUPPORT_FIELD),
+                ],
+            })
             
-            await user.send(embed=embed)
+            await self._send(user, embed=embed)
             
         except discord.Forbidden:
             pass  # User has DMs disabled
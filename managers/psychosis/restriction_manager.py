@@ -1,8 +1,36 @@
 # managers/psychosis/restriction_manager.py
+import asyncio
 import discord
 from typing import Dict, Any
 from colorama import Fore, Style
 
+# Overwrites applied per restriction type. set_permissions only serialises them,
+# so one instance of each is shared by every channel and every call.
+SILENCE_OVERWRITE = discord.PermissionOverwrite(send_messages=False, speak=False, add_reactions=False)
+VOICE_OVERWRITE = discord.PermissionOverwrite(speak=False, stream=False, use_voice_activation=False)
+FULL_OVERWRITE = discord.PermissionOverwrite(
+    send_messages=False, speak=False, add_reactions=False, connect=False, view_channel=False
+)
+ISOLATION_ALLOW_OVERWRITE = discord.PermissionOverwrite(
+    view_channel=True, send_messages=True, read_message_history=True
+)
+ISOLATION_HIDE_OVERWRITE = discord.PermissionOverwrite(view_channel=False)
+
+# Overwrite removals a single lift keeps in flight at once
+MAX_CONCURRENT_PERMISSION_EDITS = 25
+
+# Display names for the known restriction types
+RESTRICTION_NAMES = {
+    "silence": "Silence",
+    "voice_timeout": "Voice Timeout",
+    "full_restriction": "Full Restriction",
+    "isolation": "Isolation",
+}
+
+def pretty_restriction_name(restriction_type: str) -> str:
+    """Human-readable restriction type, derived from the key for unknown types"""
+    return RESTRICTION_NAMES.get(restriction_type) or restriction_type.replace("_", " ").title()
+
 class RestrictionManager:
     def __init__(self, config_manager, logger):
         self.config = config_manager
@@ -55,12 +83,7 @@ class RestrictionManager:
             if isinstance(channel, (discord.TextChannel, discord.VoiceChannel, discord.StageChannel)):
                 try:
                     total_channels += 1
-                    overwrite = discord.PermissionOverwrite()
-                    overwrite.send_messages = False
-                    overwrite.speak = False
-                    overwrite.add_reactions = False
-                    
-                    await channel.set_permissions(user, overwrite=overwrite)
+                    await channel.set_permissions(user, overwrite=SILENCE_OVERWRITE)
                     success_count += 1
                     
                 except discord.Forbidden:
@@ -82,12 +105,7 @@ class RestrictionManager:
         for channel in guild.voice_channels:
             try:
                 total_channels += 1
-                overwrite = discord.PermissionOverwrite()
-                overwrite.speak = False
-                overwrite.stream = False
-                overwrite.use_voice_activation = False
-                
-                await channel.set_permissions(user, overwrite=overwrite)
+                await channel.set_permissions(user, overwrite=VOICE_OVERWRITE)
                 success_count += 1
                 
             except discord.Forbidden:
@@ -105,14 +123,7 @@ class RestrictionManager:
         for channel in guild.channels:
             try:
                 total_channels += 1
-                overwrite = discord.PermissionOverwrite()
-                overwrite.send_messages = False
-                overwrite.speak = False
-                overwrite.add_reactions = False
-                overwrite.connect = False
-                overwrite.view_channel = False
-                
-                await channel.set_permissions(user, overwrite=overwrite)
+                await channel.set_permissions(user, overwrite=FULL_OVERWRITE)
                 success_count += 1
                 
             except discord.Forbidden:
@@ -132,17 +143,9 @@ class RestrictionManager:
             try:
                 total_channels += 1
                 
-                if channel.id == psychosis_channel_id:
-                    # Allow access to psychosis channel only
-                    overwrite = discord.PermissionOverwrite()
-                    overwrite.view_channel = True
-                    overwrite.send_messages = True
-                    overwrite.read_message_history = True
-                else:
-                    # Hide all other channels
-                    overwrite = discord.PermissionOverwrite()
-                    overwrite.view_channel = False
-                
+                # Allow access to psychosis channel only and hide all other channels
+                overwrite = (ISOLATION_ALLOW_OVERWRITE if channel.id == psychosis_channel_id
+                             else ISOLATION_HIDE_OVERWRITE)
                 await channel.set_permissions(user, overwrite=overwrite)
                 success_count += 1
                 
@@ -171,21 +174,20 @@ class RestrictionManager:
     
     async def _remove_all_overwrites(self, guild: discord.Guild, user: discord.Member) -> bool:
         """Remove all permission overwrites for a user"""
-        success_count = 0
-        total_channels = 0
+        slots = asyncio.Semaphore(MAX_CONCURRENT_PERMISSION_EDITS)
         
-        for channel in guild.channels:
-            try:
-                total_channels += 1
-                overwrites = channel.overwrites
-                if user in overwrites:
-                    await channel.set_permissions(user, overwrite=None)
-                success_count += 1
-                
-            except discord.Forbidden:
-                continue
-            except Exception:
-                continue
+        async def remove_one(channel):
+            # overwrites_for avoids building the channel's full overwrite dict
+            if channel.overwrites_for(user).is_empty():
+                return
+            async with slots:
+                await channel.set_permissions(user, overwrite=None, reason="Psychosis restriction removed")
+        
+        # Per-channel failures (Forbidden included) are counted, not raised
+        results = await asyncio.gather(*(remove_one(channel) for channel in guild.channels),
+                                       return_exceptions=True)
+        success_count = sum(1 for r in results if not isinstance(r, Exception))
+        total_channels = len(results)
         
         self.logger.console_log_system(
             f"Removed restrictions: {success_count}/{total_channels} channels", 
@@ -1,82 +1,137 @@
 # managers/psychosis/timer_manager.py
 import asyncio
-from datetime import datetime, timedelta
-from colorama import Fore, Style
+import heapq
+import time
+
+# Deadlines this close together are expired as one batch
+BATCH_WINDOW = 1.0
+# Upper bound on restriction removals running at the same time
+MAX_CONCURRENT_EXPIRIES = 5
 
 class TimerManager:
+    """Schedules automatic restriction removal.
+    
+    All deadlines live in a single min-heap drained by one runner task, instead
+    of one sleeping task per restricted user. Cancelled or replaced deadlines
+    are left in the heap and skipped when they surface (lazy deletion).
+    """
+    
     def __init__(self, psychosis_manager):
         self.psychosis_manager = psychosis_manager
-        self.active_timers = {}
+        self._heap = []        # (expiry_ts, user_id, restriction_type)
+        self._deadlines = {}   # user_id -> expiry_ts of the live heap entry
+        self._wakeup = None
+        self._runner = None
+        self._bot = None
+        self._expiry_slots = asyncio.Semaphore(MAX_CONCURRENT_EXPIRIES)
     
-    async def start_restriction_timer(self, bot, user_id: int, restriction_type: str, 
+    async def start_restriction_timer(self, bot, user_id: int, restriction_type: str,
                                     duration_minutes: int):
         """Start a timer for automatic restriction removal"""
         if duration_minutes <= 0:
             return
         
-        # Cancel existing timer if any
-        if user_id in self.active_timers:
-            self.active_timers[user_id].cancel()
-        
-        # Create new timer
-        timer_task = asyncio.create_task(
-            self._restriction_timer(bot, user_id, restriction_type, duration_minutes)
-        )
-        self.active_timers[user_id] = timer_task
+        self.schedule_expiry(bot, user_id, restriction_type, time.time() + duration_minutes * 60)
         
         self.psychosis_manager.logger.console_log_system(
             f"Started {duration_minutes}m timer for user {user_id}",
             "PSYCHOSIS"
         )
     
-    async def _restriction_timer(self, bot, user_id: int, restriction_type: str, 
-                               duration_minutes: int):
-        """Timer coroutine that removes restriction after duration"""
+    def schedule_expiry(self, bot, user_id: int, restriction_type: str, expiry_ts: float):
+        """Schedule removal at an absolute epoch time, replacing any existing deadline"""
+        self._bot = bot
+        self._deadlines[user_id] = expiry_ts
+        heapq.heappush(self._heap, (expiry_ts, user_id, restriction_type))
+        self._ensure_runner()
+    
+    def _ensure_runner(self):
+        """Start the runner if needed, or wake it so it re-checks the earliest deadline"""
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+        else:
+            self._wakeup.set()
+    
+    async def _run(self):
+        """Sleep until the earliest live deadline, expire everything due, repeat until none remain"""
         try:
-            # Wait for the duration
-            await asyncio.sleep(duration_minutes * 60)
-            
-            # Remove the restriction
-            success = await self.psychosis_manager.remove_restriction(
-                bot, user_id, "Auto-removal (timer expired)"
-            )
-            
-            if success:
-                self.psychosis_manager.logger.console_log_system(
-                    f"Auto-removed {restriction_type} restriction for user {user_id}",
-                    "PSYCHOSIS"
-                )
-            else:
-                self.psychosis_manager.logger.console_log_system(
-                    f"Failed to auto-remove restriction for user {user_id}",
-                    "WARNING"
-                )
-            
-            # Clean up timer reference
-            if user_id in self.active_timers:
-                del self.active_timers[user_id]
+            while self._deadlines:
+                expiry_ts, user_id, restriction_type = self._heap[0]
+                if self._deadlines.get(user_id) != expiry_ts:
+                    heapq.heappop(self._heap)  # Cancelled or superseded
+                    continue
+                
+                delay = expiry_ts - time.time()
+                if delay > 0:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
                 
+                await asyncio.gather(*(
+                    self._expire_bounded(uid, rtype) for uid, rtype in self._pop_due_batch()
+                ))
+            
+            self._heap.clear()
         except asyncio.CancelledError:
-            # Timer was cancelled (manual removal)
-            if user_id in self.active_timers:
-                del self.active_timers[user_id]
-        except Exception as e:
-            print(f"{Fore.RED}❌ Error in restriction timer: {e}{Style.RESET_ALL}")
+            pass
+        finally:
+            # Drop the reference so the finished task is not kept alive
+            if self._runner is asyncio.current_task():
+                self._runner = None
+    
+    def _pop_due_batch(self):
+        """Pop every live deadline due within BATCH_WINDOW of now"""
+        batch = []
+        horizon = time.time() + BATCH_WINDOW
+        while self._heap and self._heap[0][0] <= horizon:
+            expiry_ts, user_id, restriction_type = heapq.heappop(self._heap)
+            if self._deadlines.get(user_id) != expiry_ts:
+                continue  # Cancelled or superseded
+            del self._deadlines[user_id]
+            batch.append((user_id, restriction_type))
+        return batch
+    
+    async def _expire_bounded(self, user_id: int, restriction_type: str):
+        """Expire one restriction, holding one of the concurrency slots"""
+        async with self._expiry_slots:
+            try:
+                await self._expire_restriction(user_id, restriction_type)
+            except Exception as e:
+                self.psychosis_manager.logger.console_log_system(f"Error in restriction timer: {e}", "ERROR")
+    
+    async def _expire_restriction(self, user_id: int, restriction_type: str):
+        """Remove a restriction whose timer has expired"""
+        success = await self.psychosis_manager.remove_restriction(
+            self._bot, user_id, "Auto-removal (timer expired)"
+        )
+        
+        if success:
+            self.psychosis_manager.logger.console_log_system(
+                f"Auto-removed {restriction_type} restriction for user {user_id}",
+                "PSYCHOSIS"
+            )
+        else:
+            self.psychosis_manager.logger.console_log_system(
+                f"Failed to auto-remove restriction for user {user_id}",
+                "WARNING"
+            )
     
     def cancel_timer(self, user_id: int):
         """Cancel an active timer"""
-        if user_id in self.active_timers:
-            self.active_timers[user_id].cancel()
-            del self.active_timers[user_id]
-            return True
-        return False
+        return self._deadlines.pop(user_id, None) is not None
     
     def get_active_timers(self) -> dict:
         """Get info about active timers"""
         return {
             user_id: {
-                "active": not task.done(),
-                "cancelled": task.cancelled() if task.done() else False
+                "active": True,
+                "cancelled": False,
+                "expires_at": expiry_ts
             }
-            for user_id, task in self.active_timers.items()
-        }
\ No newline at end of file
+            for user_id, expiry_ts in self._deadlines.items()
+        }
@@ -2,21 +2,32 @@
 import discord
 from discord.ext import commands
 import asyncio
+import time
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 import json
 import os
-from colorama import Fore, Style
+from collections import Counter
+from utils.json_io import read_json, write_json_async
 
 from .psychosis.restriction_manager import RestrictionManager
 from .psychosis.notification_manager import NotificationManager
 from .psychosis.timer_manager import TimerManager
 
+# Restriction changes within this many seconds are written in one save
+SAVE_DELAY = 1.0
+# How long a resolved guild is reused before asking the bot again
+GUILD_CACHE_TTL = 5.0
+
 class PsychosisManager:
     def __init__(self, config_manager, logger):
         self.config = config_manager
         self.logger = logger
-        self.active_restrictions = {}
+        self.active_restrictions = {}  # user_id (int) -> restriction data
+        self._type_counts = Counter()
+        self._guild_cache = {}  # guild_id -> (resolved_at, guild)
+        self._restrictions_dirty = False
+        self._save_task = None
         
         # Get the directory where this script is located
         self.script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Go up two levels
@@ -39,35 +50,59 @@ class PsychosisManager:
         """Load active restrictions from file"""
         if os.path.exists(self.restrictions_file):
             try:
-                with open(self.restrictions_file, 'r', encoding='utf-8') as f:
-                    self.active_restrictions = json.load(f)
-            except (json.JSONDecodeError, IOError):
+                # JSON object keys are strings; convert once here rather than per lookup
+                self.active_restrictions = {
+                    int(user_id): data for user_id, data in read_json(self.restrictions_file).items()
+                }
+            except (json.JSONDecodeError, ValueError, IOError):
                 self.active_restrictions = {}
+        self._type_counts = Counter(r.get("type", "Unknown") for r in self.active_restrictions.values())
+    
+    def _schedule_save(self):
+        """Mark restrictions as changed and start a delayed save unless one is pending"""
+        self._restrictions_dirty = True
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._save_later())
+    
+    async def _save_later(self):
+        """Save once after SAVE_DELAY, again if more changes arrived during the write"""
+        await asyncio.sleep(SAVE_DELAY)
+        await self.flush()
     
-    def save_active_restrictions(self):
-        """Save active restrictions to file"""
+    async def flush(self):
+        """Write restrictions now if there are unsaved changes"""
+        while self._restrictions_dirty:
+            self._restrictions_dirty = False
+            await self.save_active_restrictions()
+    
+    async def save_active_restrictions(self):
+        """Save active restrictions to file without blocking the event loop"""
         try:
-            with open(self.restrictions_file, 'w', encoding='utf-8') as f:
-                json.dump(self.active_restrictions, f, indent=2, ensure_ascii=False)
+            # Shallow snapshot: the dict may change while the writer thread serializes.
+            # Int keys are written as JSON strings by the encoder.
+            await write_json_async(self.restrictions_file, dict(self.active_restrictions), indent=2)
         except IOError as e:
-            print(f"{Fore.RED}❌ Error saving restrictions: {e}{Style.RESET_ALL}")
+            self.logger.console_log_system(f"Error saving restrictions: {e}", "ERROR")
     
     def get_user_restriction(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Get active restriction for a user"""
-        return self.active_restrictions.get(str(user_id))
+        return self.active_restrictions.get(user_id)
     
-    def add_user_restriction(self, user_id: int, restriction_data: Dict[str, Any]):
+    async def add_user_restriction(self, user_id: int, restriction_data: Dict[str, Any]):
         """Add a new user restriction"""
-        user_key = str(user_id)
-        self.active_restrictions[user_key] = restriction_data
-        self.save_active_restrictions()
+        previous = self.active_restrictions.get(user_id)
+        if previous is not None:
+            self._type_counts[previous.get("type", "Unknown")] -= 1
+        self.active_restrictions[user_id] = restriction_data
+        self._type_counts[restriction_data.get("type", "Unknown")] += 1
+        self._schedule_save()
     
-    def remove_user_restriction(self, user_id: int) -> bool:
+    async def remove_user_restriction(self, user_id: int) -> bool:
         """Remove a user restriction"""
-        user_key = str(user_id)
-        if user_key in self.active_restrictions:
-            del self.active_restrictions[user_key]
-            self.save_active_restrictions()
+        if user_id in self.active_restrictions:
+            removed = self.active_restrictions.pop(user_id)
+            self._type_counts[removed.get("type", "Unknown")] -= 1
+            self._schedule_save()
             return True
         return False
     
@@ -90,6 +125,7 @@ class PsychosisManager:
                 "type": restriction_type,
                 "started_at": datetime.now().isoformat(),
                 "duration_minutes": duration_minutes,
+                "expiry_ts": time.time() + duration_minutes * 60,
                 "moderator_id": moderator.id,
                 "moderator_name": moderator.display_name,
                 "user_comment": user_comment,
@@ -97,7 +133,7 @@ class PsychosisManager:
                 "guild_id": guild.id
             }
             
-            self.add_user_restriction(user.id, restriction_data)
+            await self.add_user_restriction(user.id, restriction_data)
             
             # Start auto-removal timer
             await self.timer_manager.start_restriction_timer(
@@ -117,17 +153,53 @@ class PsychosisManager:
             return True
             
         except Exception as e:
-            print(f"{Fore.RED}❌ Error applying restriction: {e}{Style.RESET_ALL}")
+            self.logger.console_log_system(f"Error applying restriction: {e}", "ERROR")
             return False
     
-    async def remove_restriction(self, bot, user_id: int, reason: str = "Manual removal") -> bool:
-        """Remove a psychosis restriction from a user"""
+    async def extend_restriction(self, bot, user_id: int, additional_minutes: int) -> Optional[int]:
+        """Push a restriction's expiry back and reschedule its timer; returns the new total duration.
+        
+        Returns None when there is no live restriction, including one whose deadline has
+        passed but whose auto-removal has not finished yet. The record update, save scheduling
+        and timer change happen without yielding, so no other handler can see the new
+        duration with the old deadline.
+        """
+        restriction = self.active_restrictions.get(user_id)
+        if restriction is None:
+            return None
+        
+        now = time.time()
+        current_expiry = restriction.get("expiry_ts")
+        if current_expiry is not None and current_expiry <= now:
+            return None
+        
+        new_duration = restriction.get("duration_minutes", 0) + additional_minutes
+        # Extend from the current deadline (records without one are extended from now)
+        expiry_ts = (current_expiry or now) + additional_minutes * 60
+        
+        # Replace rather than mutate so a save in progress never serializes a half-updated record
+        self.active_restrictions[user_id] = {**restriction, "duration_minutes": new_duration, "expiry_ts": expiry_ts}
+        self._schedule_save()
+        self.timer_manager.schedule_expiry(bot, user_id, restriction.get("type", "unknown"), expiry_ts)
+        
+        self.logger.console_log_system(
+            f"Extended restriction for user {user_id} by {additional_minutes} minutes",
+            "PSYCHOSIS"
+        )
+        return new_duration
+    
+    async def remove_restriction(self, bot, user_id: int, reason: str = "Manual removal",
+                                 user_reason: Optional[str] = None) -> bool:
+        """Remove a psychosis restriction from a user.
+        
+        user_reason, when given, replaces reason in the DM to the user.
+        """
         try:
             restriction_data = self.get_user_restriction(user_id)
             if not restriction_data:
                 return False
             
-            guild = bot.get_guild(restriction_data.get("guild_id"))
+            guild = self._get_guild(bot, restriction_data.get("guild_id"))
             if not guild:
                 return False
             
@@ -140,12 +212,13 @@ class PsychosisManager:
                 guild, user, restriction_data.get("type", "unknown")
             )
             
-            # Remove from active restrictions
-            self.remove_user_restriction(user_id)
+            # Remove from active restrictions and drop any pending auto-removal
+            await self.remove_user_restriction(user_id)
+            self.timer_manager.cancel_timer(user_id)
             
             # Send end notifications
             await self.notification_manager.send_restriction_ended_notification(
-                bot, guild, user, restriction_data, reason
+                bot, guild, user, restriction_data, reason, user_reason
             )
             
             self.logger.console_log_system(
@@ -156,21 +229,44 @@ class PsychosisManager:
             return True
             
         except Exception as e:
-            print(f"{Fore.RED}❌ Error removing restriction: {e}{Style.RESET_ALL}")
+            self.logger.console_log_system(f"Error removing restriction: {e}", "ERROR")
             return False
     
+    def _get_guild(self, bot, guild_id: int) -> Optional[discord.Guild]:
+        """Resolve a guild, reusing the last lookup for GUILD_CACHE_TTL seconds"""
+        now = time.monotonic()
+        cached = self._guild_cache.get(guild_id)
+        if cached is not None and now - cached[0] < GUILD_CACHE_TTL:
+            return cached[1]
+        
+        guild = bot.get_guild(guild_id)
+        if guild is not None:
+            self._guild_cache[guild_id] = (now, guild)
+        return guild
+    
+    async def rehydrate_timers(self, bot):
+        """Reschedule persisted restrictions after a restart, removing any that already expired"""
+        now = time.time()
+        for user_id, restriction in list(self.active_restrictions.items()):
+            expiry_ts = restriction.get("expiry_ts")
+            if expiry_ts is None:
+                # Records written before expiry_ts was persisted
+                try:
+                    started = datetime.fromisoformat(restriction.get("started_at", "")).timestamp()
+                except (ValueError, TypeError):
+                    continue
+                expiry_ts = started + restriction.get("duration_minutes", 0) * 60
+            
+            if expiry_ts <= now:
+                await self.remove_restriction(bot, user_id, "Auto-removal (expired while offline)")
+            else:
+                self.timer_manager.schedule_expiry(bot, user_id, restriction.get("type", "unknown"), expiry_ts)
+    
     def get_restriction_stats(self) -> Dict[str, Any]:
         """Get statistics about active restrictions"""
-        total_restrictions = len(self.active_restrictions)
-        
-        restriction_types = {}
-        for restriction in self.active_restrictions.values():
-            r_type = restriction.get("type", "Unknown")
-            restriction_types[r_type] = restriction_types.get(r_type, 0) + 1
-        
         return {
-            "total_active": total_restrictions,
-            "by_type": restriction_types,
+            "total_active": len(self.active_restrictions),
+            "by_type": {r_type: count for r_type, count in self._type_counts.items() if count > 0},
             "oldest_restriction": min(
                 (r.get("started_at") for r in self.active_restrictions.values()),
                 default=None
@@ -1,8 +1,10 @@
 # utils/data_persistence.py
-import json
+import copy
 import os
 from typing import Dict, Any, List
 from colorama import Fore, Style
+from .json_io import read_json, write_json_async
+from .logger import log
 
 class DataPersistence:
     def __init__(self):
@@ -17,63 +19,58 @@ class DataPersistence:
         
     async def save_modstrings(self, modstrings: Dict[str, Any]):
         """Save active modstrings to disk"""
+        # Callers keep editing these dicts on the loop, so the writer thread gets a snapshot
         try:
-            with open(self.modstrings_file, 'w', encoding='utf-8') as f:
-                json.dump(modstrings, f, indent=2, ensure_ascii=False)
+            await write_json_async(self.modstrings_file, copy.deepcopy(modstrings), indent=2)
             return True
         except Exception as e:
-            print(f"{Fore.RED}❌ Error saving modstrings: {e}{Style.RESET_ALL}")
+            log.error(f"{Fore.RED}❌ Error saving modstrings: {e}{Style.RESET_ALL}")
             return False
     
     async def load_modstrings(self) -> Dict[str, Any]:
         """Load active modstrings from disk"""
         try:
             if os.path.exists(self.modstrings_file):
-                with open(self.modstrings_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return read_json(self.modstrings_file)
             return {}
         except Exception as e:
-            print(f"{Fore.RED}❌ Error loading modstrings: {e}{Style.RESET_ALL}")
+            log.error(f"{Fore.RED}❌ Error loading modstrings: {e}{Style.RESET_ALL}")
             return {}
     
     async def save_word_lists(self, word_lists: Dict[str, Any]):
         """Save word lists to disk"""
         try:
-            with open(self.lists_file, 'w', encoding='utf-8') as f:
-                json.dump(word_lists, f, indent=2, ensure_ascii=False)
+            await write_json_async(self.lists_file, copy.deepcopy(word_lists), indent=2)
             return True
         except Exception as e:
-            print(f"{Fore.RED}❌ Error saving word lists: {e}{Style.RESET_ALL}")
+            log.error(f"{Fore.RED}❌ Error saving word lists: {e}{Style.RESET_ALL}")
             return False
     
     async def load_word_lists(self) -> Dict[str, Any]:
         """Load word lists from disk"""
         try:
             if os.path.exists(self.lists_file):
-                with open(self.lists_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return read_json(self.lists_file)
             return {}
         except Exception as e:
-            print(f"{Fore.RED}❌ Error loading word lists: {e}{Style.RESET_ALL}")
+            log.error(f"{Fore.RED}❌ Error loading word lists: {e}{Style.RESET_ALL}")
             return {}
     
     async def save_state(self, state: Dict[str, Any]):
         """Save general state data"""
         try:
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(state, f, indent=2, ensure_ascii=False)
+            await write_json_async(self.state_file, copy.deepcopy(state), indent=2)
             return True
         except Exception as e:
-            print(f"{Fore.RED}❌ Error saving state: {e}{Style.RESET_ALL}")
+            log.error(f"{Fore.RED}❌ Error saving state: {e}{Style.RESET_ALL}")
             return False
     
     async def load_state(self) -> Dict[str, Any]:
         """Load general state data"""
         try:
             if os.path.exists(self.state_file):
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return read_json(self.state_file)
             return {}
         except Exception as e:
-            print(f"{Fore.RED}❌ Error loading state: {e}{Style.RESET_ALL}")
+            log.error(f"{Fore.RED}❌ Error loading state: {e}{Style.RESET_ALL}")
             return {}
\ No newline at end of file
@@ -0,0 +1,80 @@
+# utils/json_io.py
+import asyncio
+import json
+import os
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib encoder is used without it
+    orjson = None
+
+# One writer thread keeps file writes off the event loop and strictly ordered,
+# so two saves of the same file can never interleave.
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="json-writer")
+
+@contextmanager
+def atomic_open(path: str, binary: bool = False):
+    """Open a temp file for writing that atomically replaces path on success.
+
+    A crash mid-write leaves the previous file intact instead of a truncated one.
+    """
+    tmp_path = path + ".tmp"
+    try:
+        with (open(tmp_path, 'wb') if binary else open(tmp_path, 'w', encoding='utf-8')) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def dumps(data: Any, indent: Optional[int] = None, default: Optional[Callable] = None) -> str:
+    """Serialize data to a JSON string, using orjson when it is installed.
+
+    Non-ASCII text is written as-is. orjson only supports a 2-space indent,
+    so any truthy indent is treated as 2.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=default, option=option).decode('utf-8')
+    return json.dumps(data, indent=indent, ensure_ascii=False, default=default)
+
+def loads(text) -> Any:
+    """Parse a JSON string or bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def read_json(path: str) -> Any:
+    """Read and parse a JSON file (blocking)"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+def write_json(path: str, data: Any, **dump_kwargs) -> None:
+    """Serialize data and atomically write it to path (blocking)"""
+    text = dumps(data, **dump_kwargs)
+    with atomic_open(path) as f:
+        f.write(text)
+
+async def write_json_async(path: str, data: Any, **dump_kwargs) -> None:
+    """Serialize and write data on the writer thread.
+
+    The data is serialized off the event loop, so callers should pass a
+    snapshot they will not mutate until the returned coroutine completes.
+    """
+    await run_in_writer(partial(write_json, path, data, **dump_kwargs))
+
+async def run_in_writer(func, *args) -> Any:
+    """Run a blocking file write on the shared writer thread, after any queued writes"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_writer, func, *args)
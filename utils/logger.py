@@ -1,19 +1,80 @@
 # utils/logger.py
+import asyncio
+import atexit
+import gzip
+import heapq
 import json
+import logging
+import logging.handlers
 import os
+import queue
+import zlib
+from bisect import bisect_left, bisect_right
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from colorama import Fore, Style
 from core.settings import bot_settings
+from .json_io import atomic_open, dumps, loads, read_json, run_in_writer
+
+try:
+    import ijson
+except ImportError:  # Optional: the legacy JSON file is then parsed in one go
+    ijson = None
+
+# Console output goes through the "watchtower" logger. Records are queued and
+# written by a listener thread, so a slow terminal never blocks the event loop.
+log = logging.getLogger("watchtower")
+log.setLevel(logging.INFO)
+log.propagate = False
+_console_queue = queue.SimpleQueue()
+log.addHandler(logging.handlers.QueueHandler(_console_queue))
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(logging.Formatter("%(message)s"))
+_console_listener = logging.handlers.QueueListener(_console_queue, _console_handler)
+_console_listener.start()
+atexit.register(_console_listener.stop)
+
+_LEVEL_COLORS = {
+    "INFO": Fore.CYAN, "SUCCESS": Fore.GREEN, "WARNING": Fore.YELLOW,
+    "ERROR": Fore.RED, "ACTION": Fore.MAGENTA, "CASE": Fore.BLUE,
+}
+_LOG_LEVELS = {"WARNING": logging.WARNING, "ERROR": logging.ERROR}
 
 class Logger:
+    # Rewrite (compact) the flag log after this many appends
+    COMPACT_EVERY = 500
+    # New flags are batched and written this many seconds after the first one
+    FLUSH_DELAY = 2.0
+
     def __init__(self):
         self.settings = bot_settings
         self.script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.data_dir = os.path.join(self.script_dir, "data")
-        self.flagged_file = os.path.join(self.data_dir, "flagged_messages.json")
+        # Flags are stored append-only, one JSON object per line, gzip-compressed
+        self.flagged_file = os.path.join(self.data_dir, "flagged_messages.jsonl.gz")
+        self.plain_flagged_file = os.path.join(self.data_dir, "flagged_messages.jsonl")
+        self.legacy_flagged_file = os.path.join(self.data_dir, "flagged_messages.json")
         self.ensure_directories()
-        self.flagged_data = self.load_flagged_data()
+        # Flags are loaded by warmup() once the event loop is running
+        self.flagged_data = []
+        self._loaded = False
+        self._appends_since_compact = 0
+        self._pending = []  # Logged flags not yet written to disk
+        self._flush_task = None
+        self._rebuild_indexes()
+    
+    async def warmup(self):
+        """Load the flag log on a worker thread. Safe to call more than once."""
+        if self._loaded:
+            return
+        early = self.flagged_data  # Flags logged before the load finished
+        loaded = await asyncio.to_thread(self.load_flagged_data)
+        self.flagged_data = loaded + early
+        self._rebuild_indexes()
+        self._loaded = True
+        self._schedule_flush()
+        self.console_log_system(f"Loaded {len(loaded)} flagged messages", "INFO")
     
     def ensure_directories(self):
         if not os.path.exists(self.data_dir):
@@ -22,41 +83,190 @@ class Logger:
     def load_flagged_data(self) -> List[Dict[str, Any]]:
         try:
             if os.path.exists(self.flagged_file):
-                with open(self.flagged_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return []
+                return self._read_jsonl(gzip.open(self.flagged_file, 'rt', encoding='utf-8'))
+
+            # One-time migration from the uncompressed JSONL or the old single-document JSON file
+            if os.path.exists(self.plain_flagged_file):
+                entries = self._read_jsonl(open(self.plain_flagged_file, 'r', encoding='utf-8'))
+            elif os.path.exists(self.legacy_flagged_file):
+                entries = self._read_legacy_json()
+            else:
+                return []
+            self._write_all(entries)
+            return entries
         except Exception as e:
-            print(f"{Fore.RED}❌ Error loading flagged data: {e}{Style.RESET_ALL}")
+            log.error(f"{Fore.RED}❌ Error loading flagged data: {e}{Style.RESET_ALL}")
             return []
     
+    def _read_legacy_json(self) -> List[Dict[str, Any]]:
+        """Parse the old single-document JSON file, streaming it when ijson is available"""
+        if ijson is None:
+            entries = read_json(self.legacy_flagged_file)
+        else:
+            with open(self.legacy_flagged_file, 'rb') as f:
+                # use_float keeps confidences as floats rather than Decimals
+                entries = list(ijson.items(f, 'item', use_float=True))
+        for entry in entries:
+            entry["_ts"] = self._flag_ts(entry)
+        return entries
+
+    def _read_jsonl(self, f) -> List[Dict[str, Any]]:
+        """Parse flag entries from an open JSONL file, skipping damaged lines"""
+        entries = []
+        with f:
+            try:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Partially written line from an interrupted append
+                    entry["_ts"] = self._flag_ts(entry)
+                    entries.append(entry)
+            except (EOFError, gzip.BadGzipFile, zlib.error):
+                # Truncated final gzip member from an interrupted append; keep what was read
+                log.warning(f"{Fore.YELLOW}⚠️ Flag log ends in a damaged block, ignoring the rest{Style.RESET_ALL}")
+        return entries
+
     def save_flagged_data(self) -> bool:
+        """Compact the flag log: drop expired entries and rewrite the file from memory"""
+        if not self._loaded:
+            return False  # Rewriting now would drop the entries not yet loaded
         try:
-            with open(self.flagged_file, 'w', encoding='utf-8') as f:
-                json.dump(self.flagged_data, f, indent=2, ensure_ascii=False, default=str)
+            self.cleanup_old_flags()
+            self._write_all(self.flagged_data)
+            self._pending = []  # Included in the rewrite
+            self._appends_since_compact = 0
             return True
         except Exception as e:
-            print(f"{Fore.RED}❌ Error saving flagged data: {e}{Style.RESET_ALL}")
+            log.error(f"{Fore.RED}❌ Error saving flagged data: {e}{Style.RESET_ALL}")
             return False
 
+    def cleanup_old_flags(self) -> int:
+        """Drop flags older than max_case_age_days from memory. Returns the number removed.
+
+        flagged_data is time-ordered, so expired flags are always a prefix and
+        only that prefix is touched.
+        """
+        max_age_days = self.settings.get("max_case_age_days", 365)
+        if not max_age_days:
+            return 0
+
+        cutoff_ts = (datetime.now() - timedelta(days=max_age_days)).timestamp()
+        expired_count = bisect_left(self._ts_index, cutoff_ts)
+        if not expired_count:
+            return 0
+
+        expired = self.flagged_data[:expired_count]
+        del self.flagged_data[:expired_count]
+        del self._ts_index[:expired_count]
+        self._unindex_flags(expired, cutoff_ts)
+        return expired_count
+
+    def _flag_ts(self, entry: Dict[str, Any]) -> float:
+        """Epoch seconds for a flag entry's message timestamp (0 if unparseable)"""
+        try:
+            return datetime.fromisoformat(str(entry.get("timestamp", "")).replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return 0.0
+
+    def _rebuild_indexes(self):
+        """Sort flags by time and rebuild the per-user, per-channel and per-type indexes"""
+        self.flagged_data.sort(key=lambda f: f["_ts"])
+        self._ts_index = [f["_ts"] for f in self.flagged_data]
+        self._by_user = {}
+        self._by_channel = Counter()
+        self._by_type = Counter()
+        for entry in self.flagged_data:
+            self._index_flag(entry)
+
+    def _index_flag(self, entry: Dict[str, Any]):
+        """Add a single flag to the side indexes (not the time index)"""
+        self._by_user.setdefault(str(entry.get("user_id")), []).append(entry)
+        self._by_channel[entry.get("channel_name", "Unknown")] += 1
+        self._by_type.update(k for k, v in (entry.get("flags") or {}).items() if v)
+
+    def _unindex_flags(self, expired: List[Dict[str, Any]], cutoff_ts: float):
+        """Remove expired flags (all older than cutoff_ts) from the side indexes"""
+        for user_key in {str(entry.get("user_id")) for entry in expired}:
+            remaining = [f for f in self._by_user[user_key] if f["_ts"] >= cutoff_ts]
+            if remaining:
+                self._by_user[user_key] = remaining
+            else:
+                del self._by_user[user_key]
+        self._by_channel.subtract(entry.get("channel_name", "Unknown") for entry in expired)
+        self._by_type.subtract(
+            k for entry in expired for k, v in (entry.get("flags") or {}).items() if v
+        )
+        # Drop keys that reached zero
+        self._by_channel += Counter()
+        self._by_type += Counter()
+
+    def _public_flag(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """A copy of a flag entry without in-memory-only keys"""
+        return {k: v for k, v in entry.items() if k != "_ts"}
+
+    def _serialize_flag(self, entry: Dict[str, Any]) -> str:
+        """One JSONL line for a flag entry, without in-memory-only keys"""
+        return dumps(self._public_flag(entry), default=str) + "\n"
+
+    def _write_all(self, entries: List[Dict[str, Any]]):
+        """Atomically rewrite the whole JSONL file as a single gzip stream"""
+        with atomic_open(self.flagged_file, binary=True) as raw:
+            with gzip.open(raw, 'wt', encoding='utf-8', compresslevel=6) as f:
+                f.writelines(self._serialize_flag(entry) for entry in entries)
+
+    def _append_flags(self, entries: List[Dict[str, Any]]):
+        """Append flag entries to the JSONL file (as one gzip member)"""
+        with gzip.open(self.flagged_file, 'at', encoding='utf-8') as f:
+            f.writelines(self._serialize_flag(entry) for entry in entries)
+
+    def _schedule_flush(self):
+        """Start the delayed writer unless one is already pending"""
+        if self._pending and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        """Write batched flags after FLUSH_DELAY, repeating while more arrive"""
+        while self._pending:
+            await asyncio.sleep(self.FLUSH_DELAY)
+            await self.flush()
+
+    async def flush(self):
+        """Write pending flags now, compacting the file when enough appends have built up"""
+        if not self._loaded or not self._pending:
+            return
+        entries, self._pending = self._pending, []
+        self._appends_since_compact += len(entries)
+        try:
+            if self._appends_since_compact > self.COMPACT_EVERY:
+                self.cleanup_old_flags()
+                snapshot = list(self.flagged_data)  # The thread must not see later inserts
+                await run_in_writer(self._write_all, snapshot)
+                self._appends_since_compact = 0
+            else:
+                await run_in_writer(self._append_flags, entries)
+        except Exception as e:
+            log.error(f"{Fore.RED}❌ Error writing flagged data: {e}{Style.RESET_ALL}")
+
     def console_log_system(self, message: str, level: str = "INFO"):
         """A centralized method for logging system messages to the console."""
-        color_map = {
-            "INFO": Fore.CYAN, "SUCCESS": Fore.GREEN, "WARNING": Fore.YELLOW,
-            "ERROR": Fore.RED, "ACTION": Fore.MAGENTA, "CASE": Fore.BLUE,
-        }
-        color = color_map.get(level.upper(), Fore.WHITE)
-        print(f"{color}[{level.upper()}] {message}{Style.RESET_ALL}")
+        level = level.upper()
+        color = _LEVEL_COLORS.get(level, Fore.WHITE)
+        log.log(_LOG_LEVELS.get(level, logging.INFO), f"{color}[{level}] {message}{Style.RESET_ALL}")
 
     def get_all_flags(self, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
         try:
-            if user_id is not None:
-                return [f for f in self.flagged_data if str(f.get("user_id")) == str(user_id)]
-            return self.flagged_data
+            entries = self._by_user.get(str(user_id), []) if user_id is not None else self.flagged_data
+            # Copies, so callers can neither see the time index key nor edit the index
+            return [self._public_flag(entry) for entry in entries]
         except Exception as e:
-            print(f"{Fore.RED}❌ Error in get_all_flags: {e}{Style.RESET_ALL}")
+            log.error(f"{Fore.RED}❌ Error in get_all_flags: {e}{Style.RESET_ALL}")
             return []
 
-    def log_flagged_message(self, user_id: int, username: str, display_name: str, 
+    async def log_flagged_message(self, user_id: int, username: str, display_name: str,
                            content: str, timestamp: datetime, message_url: str,
                            **kwargs):
         try:
@@ -67,10 +277,74 @@ class Logger:
                 "ai_explanation": kwargs.get("ai_explanation", ""), "channel_id": kwargs.get("channel_id"),
                 "channel_name": kwargs.get("channel_name", "Unknown"),
                 "logged_at": datetime.now().isoformat(), "reviewed": False,
+                "_ts": timestamp.timestamp(),  # In memory only; parsed once for time filters
             }
-            self.flagged_data.append(flag_entry)
-            self.save_flagged_data()
+            # Keep flagged_data time-ordered; flags almost always land at the end
+            position = bisect_right(self._ts_index, flag_entry["_ts"])
+            self._ts_index.insert(position, flag_entry["_ts"])
+            self.flagged_data.insert(position, flag_entry)
+            self._index_flag(flag_entry)
+            self._pending.append(flag_entry)
+            if not self._loaded:
+                return True  # Written to disk once warmup() has read the existing log
+
+            self.cleanup_old_flags()  # Usually nothing expired: one bisect
+            self._schedule_flush()
             return True
         except Exception as e:
             self.console_log_system(f"Error logging flagged message: {e}", "ERROR")
-            return False
\ No newline at end of file
+            return False
+
+    def get_user_flags(self, user_id: int, hours: int = 24) -> Dict[str, Any]:
+        """AI flag summary for one user, with counts for the last `hours` hours"""
+        user_flags = self._by_user.get(str(user_id), [])
+        if not user_flags:
+            return {}
+
+        cutoff_ts = (datetime.now() - timedelta(hours=hours)).timestamp()
+        recent = []
+        confidence_total = 0
+        for flag in user_flags:
+            confidence_total += flag.get("confidence", 0)
+            if flag["_ts"] >= cutoff_ts:
+                recent.append(flag)
+
+        return {
+            "total_flags": len(user_flags),
+            "recent_flags": len(recent),
+            "avg_confidence": round(confidence_total / len(user_flags), 1),
+            "latest_flags": [self._public_flag(f) for f in heapq.nlargest(5, recent, key=lambda f: f["_ts"])],
+        }
+
+    def count_flags_since(self, hours: int) -> int:
+        """Number of flags from the last `hours` hours"""
+        cutoff_ts = (datetime.now() - timedelta(hours=hours)).timestamp()
+        return len(self._ts_index) - bisect_left(self._ts_index, cutoff_ts)
+
+    def get_global_stats(self, hours: int = 24) -> Dict[str, Any]:
+        """Server-wide AI flag statistics for the last `hours` hours"""
+        cutoff_ts = (datetime.now() - timedelta(hours=hours)).timestamp()
+        # flagged_data is time-ordered, so the window is a tail slice
+        recent_flags = self.flagged_data[bisect_left(self._ts_index, cutoff_ts):]
+
+        user_counts = Counter(f.get("user_id") for f in recent_flags)
+        channel_stats = Counter(f.get("channel_name", "Unknown") for f in recent_flags)
+        hourly_stats = Counter(datetime.fromtimestamp(f["_ts"]).hour for f in recent_flags)
+        flag_types = Counter(
+            flag_type
+            for f in recent_flags
+            for flag_type, value in (f.get("flags") or {}).items() if value
+        )
+
+        return {
+            "period_hours": hours,
+            "total_flags": len(recent_flags),
+            "unique_users": len(user_counts),
+            "top_users": user_counts.most_common(5),
+            "flag_types": dict(flag_types),
+            "channel_stats": dict(channel_stats),
+            "hourly_stats": dict(hourly_stats),
+            "total_flags_all_time": len(self.flagged_data),
+            "flag_types_all_time": dict(self._by_type),
+            "channel_stats_all_time": dict(self._by_channel),
+        }
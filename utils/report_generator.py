@@ -1,9 +1,75 @@
 # utils/report_generator.py
+import gzip
+import io
 import json
 import os
+import re
+import sys
+import time
 from datetime import datetime, timedelta
+from operator import itemgetter
 from typing import Dict, List, Any, Optional
-from colorama import Fore, Style
+from .json_io import atomic_open, run_in_writer
+
+# Colour terminal feedback only when a terminal is attached
+if sys.stdout.isatty():
+    from colorama import Fore, Style
+    _OK, _ERR, _RST = Fore.GREEN, Fore.RED, Style.RESET_ALL
+else:
+    _OK = _ERR = _RST = ""
+
+# Section separators
+_BAR = "=" * 60
+_SUB = "-" * 20
+
+# Header and summary sections, rendered with one format_map call per report
+_USER_REPORT_TMPL = """\
+{bar}
+USER MODERATION REPORT
+{bar}
+Generated: {generated}
+User ID: {user_id}
+Username: {user_name}
+Report Period: Last {days_back} days
+
+SUMMARY STATISTICS:
+{sub}
+Total Cases: {total_cases}
+Open Cases: {open_cases}
+Warnings: {warns}
+Timeouts: {timeouts}
+Kicks: {kicks}
+Bans: {bans}
+Escalation Level: {escalation_level}
+Trend: {trend}
+
+"""
+
+_SERVER_REPORT_TMPL = """\
+{bar}
+SERVER MODERATION REPORT
+{bar}
+Generated: {generated}
+Server: {guild_name}
+Report Period: Last {days_back} days
+
+SUMMARY STATISTICS:
+{sub}
+Total Cases: {total_cases}
+Open Cases: {open_cases}
+Resolved Cases: {resolved_cases}
+Resolution Rate: {resolution_rate:.1f}%
+Unique Users Moderated: {unique_users_moderated}
+Average Cases Per Day: {avg_cases_per_day:.1f}
+
+"""
+
+# Characters not allowed in report filenames: anything but word characters
+# (Unicode letters, digits, '_'), spaces and '-'
+_UNSAFE_NAME_RE = re.compile(r'[^\w \-]+')
+
+# Seconds a statistics result is reused across report generations
+STATS_CACHE_TTL = 60.0
 
 class ReportGenerator:
     def __init__(self, moderation_manager):
@@ -12,143 +78,180 @@ class ReportGenerator:
         self.script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Go up two levels
         self.reports_dir = os.path.join(self.script_dir, "reports")
         self.ensure_directories()
+        
+        # (kind, *args) -> (cached_at, result); cleared when StatisticsManager.version moves,
+        # which happens on every case created or updated through the ModerationManager
+        self._stats_cache = {}
+        self._stats_version = None
     
     def ensure_directories(self):
         """Ensure necessary report directories exist"""
-        if not os.path.exists(self.reports_dir):
-            os.makedirs(self.reports_dir)
+        os.makedirs(self.reports_dir, exist_ok=True)
+    
+    def _cached_stats(self, stats_mgr, key: tuple, compute):
+        """Return a cached statistics result, recomputing it when stale"""
+        version = stats_mgr.version
+        if version != self._stats_version:
+            self._stats_cache.clear()
+            self._stats_version = version
+        
+        now = time.monotonic()
+        cached = self._stats_cache.get(key)
+        if cached is not None and now - cached[0] < STATS_CACHE_TTL:
+            return cached[1]
+        
+        result = compute()
+        self._stats_cache[key] = (now, result)
+        return result
     
-    def generate_user_report(self, user_id: int, user_name: str, days_back: int = 30) -> str:
+    def bust(self):
+        """Drop all cached statistics"""
+        self._stats_cache.clear()
+    
+    def _write_report(self, filepath: str, content: str, compress: bool = False):
+        """Atomically write a finished report in one buffered write (blocking)"""
+        with atomic_open(filepath, binary=True) as f:
+            if compress:
+                # Level 1: nearly free CPU-wise, and the boilerplate compresses well
+                with gzip.GzipFile(fileobj=f, mode='wb', compresslevel=1) as gz:
+                    gz.write(content.encode('utf-8'))
+            else:
+                f.write(content.encode('utf-8'))
+    
+    async def generate_user_report(self, user_id: int, user_name: str, days_back: int = 30,
+                                   compress: bool = False) -> str:
         """Generate a comprehensive user report"""
         try:
-            # Get user statistics
-            user_stats = self.moderation_manager.statistics_manager.get_user_stats(user_id)
+            mm = self.moderation_manager
+            stats_mgr = mm.statistics_manager
+            
+            # Fetch the user's cases once, for both the statistics and the history
+            user_data = mm.user_data.get(str(user_id), {})
+            cases = user_data.get("cases", [])
+            
+            # Get user statistics (all zero without cases, so skip the lookup)
+            user_stats = self._cached_stats(
+                stats_mgr, ("user", user_id), lambda: stats_mgr.get_user_stats(user_id)
+            ) if cases else {}
             
             # Generate report filename
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"user_report_{user_id}_{timestamp}.txt"
+            now = datetime.now()
+            filename = f"user_report_{user_id}_{now.strftime('%Y%m%d_%H%M%S')}.txt"
+            if compress:
+                filename += ".gz"
             filepath = os.path.join(self.reports_dir, filename)
             
             # Generate report content
-            report_lines = [
-                "=" * 60,
-                f"USER MODERATION REPORT",
-                "=" * 60,
-                f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                f"User ID: {user_id}",
-                f"Username: {user_name}",
-                f"Report Period: Last {days_back} days",
-                "",
-                "SUMMARY STATISTICS:",
-                "-" * 20,
-                f"Total Cases: {user_stats.get('total_cases', 0)}",
-                f"Open Cases: {user_stats.get('open_cases', 0)}",
-                f"Warnings: {user_stats.get('warns', 0)}",
-                f"Timeouts: {user_stats.get('timeouts', 0)}",
-                f"Kicks: {user_stats.get('kicks', 0)}",
-                f"Bans: {user_stats.get('bans', 0)}",
-                f"Escalation Level: {user_stats.get('escalation_level', 0)}",
-                f"Trend: {user_stats.get('trend', 'Unknown').title()}",
-                "",
-            ]
-            
-            # Add case details if available
-            user_data = self.moderation_manager.user_data.get(str(user_id), {})
-            cases = user_data.get("cases", [])
+            buf = io.StringIO()
+            w = buf.write
+            w(_USER_REPORT_TMPL.format_map({
+                "bar": _BAR,
+                "sub": _SUB,
+                "generated": now.strftime('%Y-%m-%d %H:%M:%S'),
+                "user_id": user_id,
+                "user_name": user_name,
+                "days_back": days_back,
+                "total_cases": user_stats.get('total_cases', 0),
+                "open_cases": user_stats.get('open_cases', 0),
+                "warns": user_stats.get('warns', 0),
+                "timeouts": user_stats.get('timeouts', 0),
+                "kicks": user_stats.get('kicks', 0),
+                "bans": user_stats.get('bans', 0),
+                "escalation_level": user_stats.get('escalation_level', 0),
+                "trend": user_stats.get('trend', 'Unknown').title(),
+            }))
             
-            if cases:
-                report_lines.extend([
-                    "CASE HISTORY:",
-                    "-" * 20,
-                ])
+            # Add case details for the report period if available.
+            # Case timestamps are ISO strings, so they compare chronologically;
+            # filtering first keeps the sort to the report period only
+            cutoff = (now - timedelta(days=days_back)).isoformat()
+            recent = [case for case in cases if case.get("timestamp", "") >= cutoff]
+            
+            if recent:
+                w("CASE HISTORY:\n")
+                w(_SUB + "\n")
                 
-                for case in sorted(cases, key=lambda x: x.get("timestamp", ""), reverse=True):
-                    case_num = case.get("case_number", "Unknown")
-                    action = case.get("action_type", "Unknown").title()
-                    reason = case.get("reason", "No reason provided")[:50]
-                    status = case.get("status", "Unknown")
-                    timestamp = case.get("timestamp", "Unknown")
+                for case in sorted(recent, key=itemgetter("timestamp"), reverse=True):
+                    g = case.get
+                    case_num = g("case_number", "Unknown")
+                    action = g("action_type", "Unknown").title()
+                    reason = g("reason") or "No reason provided"
+                    if len(reason) > 50:
+                        reason = reason[:50]
+                    status = g("status", "Unknown")
+                    timestamp = case["timestamp"]
                     
-                    report_lines.extend([
-                        f"Case #{case_num} - {action} ({status})",
-                        f"  Date: {timestamp}",
-                        f"  Reason: {reason}",
-                        ""
-                    ])
-            
-            # Write report to file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(report_lines))
-            
-            print(f"{Fore.GREEN}✅ User report generated: {filename}{Style.RESET_ALL}")
+                    w(f"Case #{case_num} - {action} ({status})\n  Date: {timestamp}\n  Reason: {reason}\n\n")
+            
+            # Write report to file off the event loop
+            await run_in_writer(self._write_report, filepath, buf.getvalue(), compress)
+            
+            print(f"{_OK}✅ User report generated: {filename}{_RST}")
             return filename
             
         except Exception as e:
-            print(f"{Fore.RED}❌ Error generating user report: {e}{Style.RESET_ALL}")
+            print(f"{_ERR}❌ Error generating user report: {e}{_RST}")
             return ""
     
-    def generate_server_report(self, guild_name: str, days_back: int = 30) -> str:
+    async def generate_server_report(self, guild_name: str, days_back: int = 30,
+                                     compress: bool = False) -> str:
         """Generate a server-wide moderation report"""
         try:
             # Get server statistics
-            server_stats = self.moderation_manager.statistics_manager.get_moderation_summary(days_back)
+            stats_mgr = self.moderation_manager.statistics_manager
+            server_stats = self._cached_stats(
+                stats_mgr, ("summary", days_back), lambda: stats_mgr.get_moderation_summary(days_back)
+            )
             
             # Generate report filename
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            safe_guild_name = "".join(c for c in guild_name if c.isalnum() or c in (' ', '-', '_')).strip()
-            safe_guild_name = safe_guild_name.replace(' ', '_')
-            filename = f"server_report_{safe_guild_name}_{timestamp}.txt"
+            now = datetime.now()
+            safe_guild_name = _UNSAFE_NAME_RE.sub('', guild_name).strip().replace(' ', '_')
+            filename = f"server_report_{safe_guild_name}_{now.strftime('%Y%m%d_%H%M%S')}.txt"
+            if compress:
+                filename += ".gz"
             filepath = os.path.join(self.reports_dir, filename)
             
             # Generate report content
-            report_lines = [
-                "=" * 60,
-                f"SERVER MODERATION REPORT",
-                "=" * 60,
-                f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                f"Server: {guild_name}",
-                f"Report Period: Last {days_back} days",
-                "",
-                "SUMMARY STATISTICS:",
-                "-" * 20,
-                f"Total Cases: {server_stats.get('total_cases', 0)}",
-                f"Open Cases: {server_stats.get('open_cases', 0)}",
-                f"Resolved Cases: {server_stats.get('resolved_cases', 0)}",
-                f"Resolution Rate: {server_stats.get('resolution_rate', 0):.1f}%",
-                f"Unique Users Moderated: {server_stats.get('unique_users_moderated', 0)}",
-                f"Average Cases Per Day: {server_stats.get('avg_cases_per_day', 0):.1f}",
-                "",
-            ]
+            buf = io.StringIO()
+            w = buf.write
+            w(_SERVER_REPORT_TMPL.format_map({
+                "bar": _BAR,
+                "sub": _SUB,
+                "generated": now.strftime('%Y-%m-%d %H:%M:%S'),
+                "guild_name": guild_name,
+                "days_back": days_back,
+                "total_cases": server_stats.get('total_cases', 0),
+                "open_cases": server_stats.get('open_cases', 0),
+                "resolved_cases": server_stats.get('resolved_cases', 0),
+                "resolution_rate": server_stats.get('resolution_rate', 0),
+                "unique_users_moderated": server_stats.get('unique_users_moderated', 0),
+                "avg_cases_per_day": server_stats.get('avg_cases_per_day', 0),
+            }))
             
             # Add action breakdown
             action_breakdown = server_stats.get('action_breakdown', {})
             if action_breakdown:
-                report_lines.extend([
-                    "ACTION BREAKDOWN:",
-                    "-" * 20,
-                ])
-                for action, count in sorted(action_breakdown.items(), key=lambda x: x[1], reverse=True):
-                    report_lines.append(f"{action.title()}: {count}")
-                report_lines.append("")
+                w("ACTION BREAKDOWN:\n")
+                w(_SUB + "\n")
+                for action, count in action_breakdown.most_common():
+                    w(f"{action.title()}: {count}\n")
+                w("\n")
             
             # Add moderator activity
             mod_activity = server_stats.get('moderator_activity', {})
             if mod_activity:
-                report_lines.extend([
-                    "TOP MODERATORS:",
-                    "-" * 20,
-                ])
-                for mod, cases in list(mod_activity.items())[:10]:
-                    report_lines.append(f"{mod}: {cases} cases")
-                report_lines.append("")
-            
-            # Write report to file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(report_lines))
-            
-            print(f"{Fore.GREEN}✅ Server report generated: {filename}{Style.RESET_ALL}")
+                w("TOP MODERATORS:\n")
+                w(_SUB + "\n")
+                for mod, cases in mod_activity.most_common(10):
+                    w(f"{mod}: {cases} cases\n")
+                w("\n")
+            
+            # Write report to file off the event loop
+            await run_in_writer(self._write_report, filepath, buf.getvalue(), compress)
+            
+            print(f"{_OK}✅ Server report generated: {filename}{_RST}")
             return filename
             
         except Exception as e:
-            print(f"{Fore.RED}❌ Error generating server report: {e}{Style.RESET_ALL}")
+            print(f"{_ERR}❌ Error generating server report: {e}{_RST}")
             return ""
\ No newline at end of file
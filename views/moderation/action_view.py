@@ -1,218 +1,267 @@
 # views/moderation/action_view.py
+import asyncio
 import discord
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
 from .modals import WarnModal, TimeoutModal, KickModal, BanModal, ModNoteModal, SilenceModal
 
+@dataclass(frozen=True, slots=True)
+class ModContext:
+    """Target and flagged-message context shared by a moderation panel and its sub-views"""
+    target_user: discord.Member
+    moderation_manager: Any
+    is_flagged_message: bool = False
+    flagged_message: str = ""
+    message_url: str = ""
+    # Resolved once per panel rather than on every render
+    display_name: str = field(init=False)
+    avatar_url: str = field(init=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "display_name", self.target_user.display_name)
+        object.__setattr__(self, "avatar_url", self.target_user.display_avatar.url)
+
+# Moderation actions offered in the select menu: (label, description, emoji, modal)
+_ACTIONS = (
+    ("Warn User", "Issue a warning to the user", "⚠️", WarnModal),
+    ("Timeout User", "Temporarily timeout the user", "⏰", TimeoutModal),
+    ("Add Mod Note", "Add an internal note about the user", "📝", ModNoteModal),
+    ("Silence User", "Remove messaging permissions", "🔇", SilenceModal),
+    ("Kick User", "Remove user from server", "👢", KickModal),
+    ("Ban User", "Permanently ban user from server", "🔨", BanModal),
+)
+_ACTION_MODALS = {label: modal for label, _, _, modal in _ACTIONS}
+
+# Button handlers that hit Discord or disk run at most this many at once,
+# so a burst of clicks cannot starve unrelated interactions
+MAX_CONCURRENT_ACTIONS = 4
+_ACTION_SLOTS = asyncio.Semaphore(MAX_CONCURRENT_ACTIONS)
+
+# Permissions summarised on the user profile: (Permissions attribute, label)
+_KEY_PERMS = (
+    ("administrator", "Administrator"),
+    ("manage_guild", "Manage Server"),
+    ("manage_channels", "Manage Channels"),
+    ("manage_messages", "Manage Messages"),
+    ("kick_members", "Kick Members"),
+    ("ban_members", "Ban Members"),
+)
+
+def _make_action_data(action_type: str, reason: str, severity: str, duration, moderator, target) -> dict:
+    """Case payload for the panel's quick actions (no DM is sent for these)"""
+    return {
+        "action_type": action_type,
+        "reason": reason,
+        "severity": severity,
+        "duration": duration,
+        "dm_sent": False,
+        "moderator_name": moderator.display_name,
+        "display_name": target.display_name,
+        "username": target.name
+    }
+
+# Strong references to in-flight background case writes
+_pending_case_writes = set()
+
+def _record_case_later(moderation_manager, user_id: int, action_data: dict):
+    """Create a moderation case in the background once the interaction has been answered"""
+    async def record():
+        try:
+            await moderation_manager.create_moderation_case(user_id, action_data)
+        except Exception as e:
+            moderation_manager.logger.console_log_system(f"Error recording case for user {user_id}: {e}", "ERROR")
+    
+    task = asyncio.create_task(record())
+    _pending_case_writes.add(task)
+    task.add_done_callback(_pending_case_writes.discard)
+
+# Fixed-layout embeds; only the target's name varies between renders
+_MAIN_EMBED = {
+    "title": "🛡️ Moderation Actions - {name}",
+    "description": "Choose a moderation action to take",
+    "color": discord.Color.blue().value,
+}
+_QUICK_ACTIONS_EMBED = {
+    "title": "⚡ Quick Actions",
+    "description": "Quick moderation actions for {name}",
+    "color": discord.Color.blue().value,
+    "fields": [{
+        "name": "🔧 Available Quick Actions",
+        "value": "• **5min Timeout** - Quick 5 minute timeout\n• **1hr Timeout** - Standard 1 hour timeout\n• **Remove Timeout** - Remove existing timeout\n• **Quick Warn** - Issue standard warning\n• **Collect Evidence** - Gather recent messages",
+        "inline": False,
+    }],
+}
+
+def _render_embed(template: dict, name: str) -> discord.Embed:
+    """Build an embed from one of the templates above for the given display name"""
+    data = dict(template)
+    # from_dict keeps the list it is given, so each embed gets its own fields
+    data["fields"] = [dict(f) for f in template.get("fields", [])]
+    data["title"] = template["title"].format(name=name)
+    data["description"] = template["description"].format(name=name)
+    return discord.Embed.from_dict(data)
+
 class ModActionView(discord.ui.View):
     def __init__(self, target_user: discord.Member, moderation_manager, is_flagged_message: bool = False, 
                  flagged_message: str = "", message_url: str = ""):
         super().__init__(timeout=300)
-        self.target_user = target_user
-        self.moderation_manager = moderation_manager
-        self.is_flagged_message = is_flagged_message
-        self.flagged_message = flagged_message
-        self.message_url = message_url
+        self.ctx = ModContext(target_user, moderation_manager, is_flagged_message, flagged_message, message_url)
 
     @discord.ui.select(
         placeholder="Choose a moderation action...",
         options=[
-            discord.SelectOption(label="Warn User", description="Issue a warning to the user", emoji="⚠️"),
-            discord.SelectOption(label="Timeout User", description="Temporarily timeout the user", emoji="⏰"),
-            discord.SelectOption(label="Add Mod Note", description="Add an internal note about the user", emoji="📝"),
-            discord.SelectOption(label="Silence User", description="Remove messaging permissions", emoji="🔇"),
-            discord.SelectOption(label="Kick User", description="Remove user from server", emoji="👢"),
-            discord.SelectOption(label="Ban User", description="Permanently ban user from server", emoji="🔨"),
+            discord.SelectOption(label=label, description=description, emoji=emoji)
+            for label, description, emoji, _ in _ACTIONS
         ]
     )
     async def action_select(self, interaction: discord.Interaction, select: discord.ui.Select):
         action = select.values[0]
         
         # ✅ CORRECT: Using logger through moderation manager
-        self.moderation_manager.logger.console_log_command(f"Moderation Action - {action}", interaction.user, 
-                                                         f"Target: {self.target_user.name}")
+        ctx = self.ctx
+        ctx.moderation_manager.logger.console_log_command(f"Moderation Action - {action}", interaction.user, 
+                                                        f"Target: {ctx.target_user.name}")
         
-        if action == "Warn User":
-            modal = WarnModal(self.target_user, self.moderation_manager, self.is_flagged_message, 
-                            self.flagged_message, self.message_url)
-            await interaction.response.send_modal(modal)
-        elif action == "Timeout User":
-            modal = TimeoutModal(self.target_user, self.moderation_manager, self.is_flagged_message,
-                               self.flagged_message, self.message_url)
-            await interaction.response.send_modal(modal)
-        elif action == "Add Mod Note":
-            modal = ModNoteModal(self.target_user, self.moderation_manager, self.is_flagged_message,
-                               self.flagged_message, self.message_url)
-            await interaction.response.send_modal(modal)
-        elif action == "Silence User":
-            modal = SilenceModal(self.target_user, self.moderation_manager, self.is_flagged_message,
-                               self.flagged_message, self.message_url)
-            await interaction.response.send_modal(modal)
-        elif action == "Kick User":
-            modal = KickModal(self.target_user, self.moderation_manager, self.is_flagged_message,
-                            self.flagged_message, self.message_url)
-            await interaction.response.send_modal(modal)
-        elif action == "Ban User":
-            modal = BanModal(self.target_user, self.moderation_manager, self.is_flagged_message,
-                           self.flagged_message, self.message_url)
+        modal_cls = _ACTION_MODALS.get(action)
+        if modal_cls:
+            modal = modal_cls(ctx.target_user, ctx.moderation_manager, ctx.is_flagged_message,
+                              ctx.flagged_message, ctx.message_url)
             await interaction.response.send_modal(modal)
     
     @discord.ui.button(label="View Cases", style=discord.ButtonStyle.secondary, emoji="📋")
     async def view_cases(self, interaction: discord.Interaction, button: discord.ui.Button):
         """View all cases for this user"""
-        # ✅ CORRECT: Using our new case manager structure
-        cases = self.moderation_manager.case_manager.get_user_cases(self.target_user.id)
-        
-        if not cases:
-            embed = discord.Embed(
-                title="📋 User Cases",
-                description=f"{self.target_user.display_name} has no moderation cases.",
-                color=discord.Color.blue()
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-            return
-        
-        # Sort cases by case number (newest first)
-        sorted_cases = sorted(cases, key=lambda x: x.get("case_number", 0), reverse=True)
-        
-        embed = discord.Embed(
-            title=f"📋 Cases for {self.target_user.display_name}",
-            description=f"Showing {len(cases)} total cases",
-            color=discord.Color.blue()
-        )
-        
-        # Show up to 10 most recent cases
-        for case in sorted_cases[:10]:
-            status_emoji = "🟢" if case.get("status") == "Resolved" else "🟡"
-            case_text = f"{status_emoji} **{case.get('action_type', 'Unknown').title()}** - {case.get('severity', 'Medium')}\n"
-            case_text += f"*{case.get('reason', 'No reason')[:60]}...*\n"
-            case_text += f"By: {case.get('moderator_name', 'Unknown')}"
-            
-            embed.add_field(
-                name=f"Case #{case.get('case_number', 'Unknown')}",
-                value=case_text,
-                inline=True
-            )
-        
-        if len(cases) > 10:
-            embed.set_footer(text=f"Showing 10 of {len(cases)} cases. Use /stats @{self.target_user.name} for full history.")
-        
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-    
-    @discord.ui.button(label="User Profile", style=discord.ButtonStyle.secondary, emoji="👤")
-    async def view_profile(self, interaction: discord.Interaction, button: discord.ui.Button):
-        """View detailed user profile information"""
+        await interaction.response.defer(ephemeral=True)
         try:
-            # ✅ CORRECT: Using statistics manager through main manager
-            user_stats = self.moderation_manager.statistics_manager.get_user_stats(self.target_user.id)
-            
-            # Get AI flags if logger is available
-            ai_flags = {}
-            if hasattr(self.moderation_manager, 'logger'):
-                ai_flags = self.moderation_manager.logger.get_user_flags(self.target_user.id, 168)  # Last week
+            async with _ACTION_SLOTS:
+                snapshot = await self.ctx.moderation_manager.get_user_panel_snapshot(self.ctx.target_user.id)
+            cases = snapshot["cases"]
+            
+            if not cases:
+                embed = discord.Embed(
+                    title="📋 User Cases",
+                    description=f"{self.ctx.display_name} has no moderation cases.",
+                    color=discord.Color.blue()
+                )
+                await interaction.followup.send(embed=embed, ephemeral=True)
+                return
             
             embed = discord.Embed(
-                title=f"👤 User Profile - {self.target_user.display_name}",
-                description="Comprehensive user information and statistics",
-                color=discord.Color.blue(),
-                timestamp=datetime.now()
+                title=f"📋 Cases for {self.ctx.display_name}",
+                description=f"Showing {len(cases)} total cases",
+                color=discord.Color.blue()
             )
             
-            embed.set_thumbnail(url=self.target_user.display_avatar.url)
+            # Show up to 10 most recent cases
+            format_snippet = self.ctx.moderation_manager.case_manager.format_display_snippet
+            for case in cases[:10]:  # Already sorted newest first
+                # Cases saved before snippets existed are formatted on the fly
+                case_text = case.get("display_snippet") or format_snippet(case)
+                
+                embed.add_field(
+                    name=f"Case #{case.get('case_number', 'Unknown')}",
+                    value=case_text,
+                    inline=True
+                )
             
-            # Basic information
-            embed.add_field(
-                name="📊 Basic Information",
-                value=f"**Username:** {self.target_user.name}\n**Display Name:** {self.target_user.display_name}\n**User ID:** {self.target_user.id}\n**Account Created:** <t:{int(self.target_user.created_at.timestamp())}:R>",
-                inline=True
-            )
+            if len(cases) > 10:
+                embed.set_footer(text=f"Showing 10 of {len(cases)} cases. Use /stats @{self.ctx.target_user.name} for full history.")
             
-            # Server information
-            joined_at = self.target_user.joined_at
-            embed.add_field(
-                name="🏠 Server Information",
-                value=f"**Joined Server:** {f'<t:{int(joined_at.timestamp())}:R>' if joined_at else 'Unknown'}\n**Highest Role:** {self.target_user.top_role.name}\n**Role Count:** {len(self.target_user.roles) - 1}\n**Is Bot:** {'Yes' if self.target_user.bot else 'No'}",
-                inline=True
-            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
             
-            # Moderation statistics
-            embed.add_field(
-                name="⚖️ Moderation History",
-                value=f"**Total Cases:** {user_stats.get('total_cases', 0)}\n**Open Cases:** {user_stats.get('open_cases', 0)}\n**Warnings:** {user_stats.get('warns', 0)}\n**Timeouts:** {user_stats.get('timeouts', 0)}",
-                inline=True
+        except Exception as e:
+            self.ctx.moderation_manager.logger.console_log_system(
+                f"Error loading cases for user {self.ctx.target_user.id}: {e!r}", "ERROR"
             )
+            await interaction.followup.send("❌ Failed to load cases. The details have been logged.", ephemeral=True)
+    
+    @discord.ui.button(label="User Profile", style=discord.ButtonStyle.secondary, emoji="👤")
+    async def view_profile(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """View detailed user profile information"""
+        # Acknowledge first so the stats work below can't miss Discord's 3s deadline
+        await interaction.response.defer(ephemeral=True)
+        try:
+            ctx = self.ctx
+            user = ctx.target_user
+            display_name = ctx.display_name
+            roles = user.roles
+            perms = user.guild_permissions
+            avatar = ctx.avatar_url
+            created = discord.utils.format_dt(user.created_at, 'R')
+            
+            # Stats and last week's AI flags; the profile doesn't list cases, so no case files are read
+            summary = ctx.moderation_manager.get_user_profile_summary(user.id)
+            user_stats = summary["stats"]
+            ai_flags = summary["ai_flags"]
+            
+            joined = discord.utils.format_dt(user.joined_at, 'R') if user.joined_at else 'Unknown'
+            role_count = len(roles) - 1  # Exclude @everyone
+            fields = [
+                {
+                    "name": "📊 Basic Information",
+                    "value": f"**Username:** {user.name}\n**Display Name:** {display_name}\n**User ID:** {user.id}\n**Account Created:** {created}",
+                    "inline": True,
+                },
+                {
+                    "name": "🏠 Server Information",
+                    "value": f"**Joined Server:** {joined}\n**Highest Role:** {user.top_role.name}\n**Role Count:** {role_count}\n**Is Bot:** {'Yes' if user.bot else 'No'}",
+                    "inline": True,
+                },
+                {
+                    "name": "⚖️ Moderation History",
+                    "value": f"**Total Cases:** {user_stats.get('total_cases', 0)}\n**Open Cases:** {user_stats.get('open_cases', 0)}\n**Warnings:** {user_stats.get('warns', 0)}\n**Timeouts:** {user_stats.get('timeouts', 0)}",
+                    "inline": True,
+                },
+            ]
             
             # AI monitoring (if available)
             if ai_flags:
-                embed.add_field(
-                    name="🤖 AI Monitoring",
-                    value=f"**Total Flags:** {ai_flags.get('total_flags', 0)}\n**Recent Flags (7d):** {ai_flags.get('recent_flags', 0)}\n**Average Confidence:** {ai_flags.get('avg_confidence', 0)}%\n**Escalation Level:** {user_stats.get('escalation_level', 0)}",
-                    inline=True
-                )
+                fields.append({
+                    "name": "🤖 AI Monitoring",
+                    "value": f"**Total Flags:** {ai_flags.get('total_flags', 0)}\n**Recent Flags (7d):** {ai_flags.get('recent_flags', 0)}\n**Average Confidence:** {ai_flags.get('avg_confidence', 0)}%\n**Escalation Level:** {user_stats.get('escalation_level', 0)}",
+                    "inline": True,
+                })
             
             # Role list (if not too many)
-            roles = [role.name for role in self.target_user.roles[1:]]  # Exclude @everyone
-            if len(roles) <= 10:
-                embed.add_field(
-                    name="🎭 Roles",
-                    value=", ".join(roles) if roles else "No special roles",
-                    inline=True
-                )
+            if role_count <= 10:
+                role_names = [role.name for role in roles[1:]]
+                roles_value = ", ".join(role_names) if role_names else "No special roles"
             else:
-                embed.add_field(
-                    name="🎭 Roles",
-                    value=f"{len(roles)} roles (too many to display)",
-                    inline=True
-                )
+                roles_value = f"{role_count} roles (too many to display)"
+            fields.append({"name": "🎭 Roles", "value": roles_value, "inline": True})
             
             # Key permissions summary
-            key_permissions = []
-            perms = self.target_user.guild_permissions
-            if perms.administrator:
-                key_permissions.append("Administrator")
-            if perms.manage_guild:
-                key_permissions.append("Manage Server")
-            if perms.manage_channels:
-                key_permissions.append("Manage Channels")
-            if perms.manage_messages:
-                key_permissions.append("Manage Messages")
-            if perms.kick_members:
-                key_permissions.append("Kick Members")
-            if perms.ban_members:
-                key_permissions.append("Ban Members")
-            
-            embed.add_field(
-                name="🔑 Key Permissions",
-                value=", ".join(key_permissions) if key_permissions else "No special permissions",
-                inline=False
-            )
+            key_permissions = [label for attr, label in _KEY_PERMS if getattr(perms, attr)]
+            fields.append({
+                "name": "🔑 Key Permissions",
+                "value": ", ".join(key_permissions) if key_permissions else "No special permissions",
+                "inline": False,
+            })
+            
+            embed = discord.Embed.from_dict({
+                "title": f"👤 User Profile - {display_name}",
+                "description": "Comprehensive user information and statistics",
+                "color": discord.Color.blue().value,
+                "timestamp": discord.utils.utcnow().isoformat(),
+                "thumbnail": {"url": avatar},
+                "fields": fields,
+            })
             
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.followup.send(embed=embed, ephemeral=True)
             
         except Exception as e:
-            error_embed = discord.Embed(
-                title="❌ Error",
-                description=f"Failed to load user profile: {str(e)}",
-                color=discord.Color.red()
+            self.ctx.moderation_manager.logger.console_log_system(
+                f"Error loading profile for user {self.ctx.target_user.id}: {e!r}", "ERROR"
             )
-            await interaction.response.send_message(embed=error_embed, ephemeral=True)
+            await interaction.followup.send("❌ Failed to load user profile. The details have been logged.", ephemeral=True)
     
     @discord.ui.button(label="Quick Actions", style=discord.ButtonStyle.primary, emoji="⚡")
     async def quick_actions(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Show quick action menu for common moderation tasks"""
-        embed = discord.Embed(
-            title="⚡ Quick Actions",
-            description=f"Quick moderation actions for {self.target_user.display_name}",
-            color=discord.Color.blue()
-        )
-        
-        embed.add_field(
-            name="🔧 Available Quick Actions",
-            value="• **5min Timeout** - Quick 5 minute timeout\n• **1hr Timeout** - Standard 1 hour timeout\n• **Remove Timeout** - Remove existing timeout\n• **Quick Warn** - Issue standard warning\n• **Collect Evidence** - Gather recent messages",
-            inline=False
-        )
+        embed = _render_embed(_QUICK_ACTIONS_EMBED, self.ctx.display_name)
         
-        view = QuickActionsView(self.target_user, self.moderation_manager, self.is_flagged_message, 
-                               self.flagged_message, self.message_url)
+        view = QuickActionsView(self.ctx, parent_view=self)
         
         await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
     
@@ -224,72 +273,57 @@ class ModActionView(discord.ui.View):
             description="Moderation action has been cancelled.",
             color=discord.Color.red()
         )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-        
-        # Disable the view
-        for item in self.children:
-            item.disabled = True
+        self.stop()
         
+        # Replace the panel with the notice and drop its components in one edit
         try:
-            await interaction.edit_original_response(view=self)
-        except:
+            await interaction.response.edit_message(embed=embed, view=None)
+        except discord.HTTPException:
             pass  # Message might have been deleted
 
 class QuickActionsView(discord.ui.View):
-    def __init__(self, target_user: discord.Member, moderation_manager, is_flagged_message: bool = False,
-                 flagged_message: str = "", message_url: str = ""):
+    def __init__(self, ctx: ModContext, parent_view: ModActionView = None):
         super().__init__(timeout=300)
-        self.target_user = target_user
-        self.moderation_manager = moderation_manager
-        self.is_flagged_message = is_flagged_message
-        self.flagged_message = flagged_message
-        self.message_url = message_url
+        self.ctx = ctx
+        self.parent_view = parent_view
 
     @discord.ui.button(label="5min Timeout", style=discord.ButtonStyle.secondary, emoji="⏰")
     async def quick_timeout_5min(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Apply a quick 5-minute timeout"""
         try:
-            await interaction.response.defer()
+            await interaction.response.defer(ephemeral=True)
             
             # ✅ CORRECT: Using action executor through main manager
-            success = await self.moderation_manager.action_executor.timeout_user(
-                interaction.guild,
-                self.target_user,
-                5,  # 5 minutes
-                "Quick timeout - 5 minutes",
-                interaction.user,
-                send_dm=False
-            )
+            async with _ACTION_SLOTS:
+                success = await self.ctx.moderation_manager.action_executor.timeout_user(
+                    interaction.guild,
+                    self.ctx.target_user,
+                    5,  # 5 minutes
+                    "Quick timeout - 5 minutes",
+                    interaction.user,
+                    send_dm=False
+                )
             
             if not success:
                 await interaction.followup.send("❌ Failed to apply timeout. Check bot permissions.", ephemeral=True)
                 return
             
-            # ✅ CORRECT: Using new case creation method
-            action_data = {
-                "action_type": "timeout",
-                "reason": "Quick timeout - 5 minutes",
-                "severity": "Low",
-                "duration": 5,
-                "dm_sent": False,
-                "moderator_name": interaction.user.display_name,
-                "display_name": self.target_user.display_name,
-                "username": self.target_user.name
-            }
-            
-            case_number = await self.moderation_manager.create_moderation_case(self.target_user.id, action_data)
+            action_data = _make_action_data("timeout", "Quick timeout - 5 minutes", "Low", 5, interaction.user, self.ctx.target_user)
             
             embed = discord.Embed(
                 title="✅ Quick Timeout Applied",
-                description=f"5-minute timeout applied to {self.target_user.display_name}",
+                description=f"5-minute timeout applied to {self.ctx.display_name}",
                 color=discord.Color.green()
             )
-            embed.add_field(name="Case Number", value=f"#{case_number}", inline=True)
+            embed.add_field(name="Case Number", value="Pending", inline=True)
             embed.add_field(name="Duration", value="5 minutes", inline=True)
-            embed.add_field(name="Auto-Resolves", value=f"<t:{int((datetime.now() + timedelta(minutes=5)).timestamp())}:R>", inline=True)
+            embed.add_field(name="Auto-Resolves", value=discord.utils.format_dt(discord.utils.utcnow() + timedelta(minutes=5), 'R'), inline=True)
             
             await interaction.followup.send(embed=embed, ephemeral=True)
             
+            # The timeout is already live; record the case after the moderator has their reply
+            _record_case_later(self.ctx.moderation_manager, self.ctx.target_user.id, action_data)
+            
         except Exception as e:
             await interaction.followup.send(f"❌ Error applying timeout: {str(e)}", ephemeral=True)
 
@@ -297,47 +331,39 @@ class QuickActionsView(discord.ui.View):
     async def quick_timeout_1hr(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Apply a quick 1-hour timeout"""
         try:
-            await interaction.response.defer()
+            await interaction.response.defer(ephemeral=True)
             
             # ✅ CORRECT: Using action executor
-            success = await self.moderation_manager.action_executor.timeout_user(
-                interaction.guild,
-                self.target_user,
-                60,  # 60 minutes
-                "Quick timeout - 1 hour",
-                interaction.user,
-                send_dm=False
-            )
+            async with _ACTION_SLOTS:
+                success = await self.ctx.moderation_manager.action_executor.timeout_user(
+                    interaction.guild,
+                    self.ctx.target_user,
+                    60,  # 60 minutes
+                    "Quick timeout - 1 hour",
+                    interaction.user,
+                    send_dm=False
+                )
             
             if not success:
                 await interaction.followup.send("❌ Failed to apply timeout. Check bot permissions.", ephemeral=True)
                 return
             
-            # ✅ CORRECT: Using new case creation method
-            action_data = {
-                "action_type": "timeout",
-                "reason": "Quick timeout - 1 hour",
-                "severity": "Medium",
-                "duration": 60,
-                "dm_sent": False,
-                "moderator_name": interaction.user.display_name,
-                "display_name": self.target_user.display_name,
-                "username": self.target_user.name
-            }
-            
-            case_number = await self.moderation_manager.create_moderation_case(self.target_user.id, action_data)
+            action_data = _make_action_data("timeout", "Quick timeout - 1 hour", "Medium", 60, interaction.user, self.ctx.target_user)
             
             embed = discord.Embed(
                 title="✅ Quick Timeout Applied",
-                description=f"1-hour timeout applied to {self.target_user.display_name}",
+                description=f"1-hour timeout applied to {self.ctx.display_name}",
                 color=discord.Color.green()
             )
-            embed.add_field(name="Case Number", value=f"#{case_number}", inline=True)
+            embed.add_field(name="Case Number", value="Pending", inline=True)
             embed.add_field(name="Duration", value="1 hour", inline=True)
-            embed.add_field(name="Auto-Resolves", value=f"<t:{int((datetime.now() + timedelta(hours=1)).timestamp())}:R>", inline=True)
+            embed.add_field(name="Auto-Resolves", value=discord.utils.format_dt(discord.utils.utcnow() + timedelta(hours=1), 'R'), inline=True)
             
             await interaction.followup.send(embed=embed, ephemeral=True)
             
+            # The timeout is already live; record the case after the moderator has their reply
+            _record_case_later(self.ctx.moderation_manager, self.ctx.target_user.id, action_data)
+            
         except Exception as e:
             await interaction.followup.send(f"❌ Error applying timeout: {str(e)}", ephemeral=True)
 
@@ -345,18 +371,19 @@ class QuickActionsView(discord.ui.View):
     async def remove_timeout(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Remove existing timeout"""
         try:
-            await interaction.response.defer()
+            await interaction.response.defer(ephemeral=True)
             
-            if not self.target_user.is_timed_out():
+            if not self.ctx.target_user.is_timed_out():
                 await interaction.followup.send("❌ User is not currently timed out.", ephemeral=True)
                 return
             
             # Remove timeout directly (this is a Discord API call, not our moderation action)
-            await self.target_user.timeout(None, reason=f"Timeout removed by {interaction.user.display_name}")
+            async with _ACTION_SLOTS:
+                await self.ctx.target_user.timeout(None, reason=f"Timeout removed by {interaction.user.display_name}")
             
             embed = discord.Embed(
                 title="✅ Timeout Removed",
-                description=f"Timeout removed from {self.target_user.display_name}",
+                description=f"Timeout removed from {self.ctx.display_name}",
                 color=discord.Color.green()
             )
             embed.add_field(name="Removed By", value=interaction.user.display_name, inline=True)
@@ -371,20 +398,20 @@ class QuickActionsView(discord.ui.View):
     @discord.ui.button(label="Quick Warn", style=discord.ButtonStyle.secondary, emoji="⚠️")
     async def quick_warn(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Issue a quick warning"""
-        modal = QuickWarnModal(self.target_user, self.moderation_manager, self.is_flagged_message,
-                              self.flagged_message, self.message_url)
+        modal = QuickWarnModal(self.ctx)
         await interaction.response.send_modal(modal)
 
     @discord.ui.button(label="Collect Evidence", style=discord.ButtonStyle.secondary, emoji="🔍")
     async def collect_evidence(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Collect recent messages from the user"""
         try:
-            await interaction.response.defer()
+            await interaction.response.defer(ephemeral=True)
             
             # ✅ CORRECT: Using delegated method that calls message_collector internally
-            messages = await self.moderation_manager.collect_user_messages(
-                interaction.guild, self.target_user.id, limit=10
-            )
+            async with _ACTION_SLOTS:
+                messages = await self.ctx.moderation_manager.collect_user_messages(
+                    interaction.guild, self.ctx.target_user.id, limit=10
+                )
             
             if not messages:
                 await interaction.followup.send("❌ No recent messages found for this user.", ephemeral=True)
@@ -392,17 +419,16 @@ class QuickActionsView(discord.ui.View):
             
             embed = discord.Embed(
                 title="🔍 Evidence Collection",
-                description=f"Recent messages from {self.target_user.display_name}",
+                description=f"Recent messages from {self.ctx.display_name}",
                 color=discord.Color.blue()
             )
             
             for i, msg in enumerate(messages[:5], 1):  # Show top 5 messages
-                timestamp = datetime.fromisoformat(msg['timestamp'].replace('Z', '+00:00')).replace(tzinfo=None)
                 content = msg['content'][:100] + "..." if len(msg['content']) > 100 else msg['content']
                 
                 embed.add_field(
                     name=f"Message {i} - #{msg['channel']}",
-                    value=f"**Content:** {content}\n**Time:** <t:{int(timestamp.timestamp())}:R>",
+                    value=f"**Content:** {content}\n**Time:** <t:{msg['unix_ts']}:R>",
                     inline=False
                 )
             
@@ -417,26 +443,21 @@ class QuickActionsView(discord.ui.View):
     @discord.ui.button(label="Back", style=discord.ButtonStyle.secondary, emoji="◀️")
     async def back_to_main(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Go back to main moderation view"""
-        main_view = ModActionView(self.target_user, self.moderation_manager, self.is_flagged_message,
-                                 self.flagged_message, self.message_url)
+        # Reuse the panel we came from unless it has already timed out
+        main_view = self.parent_view
+        if main_view is None or main_view.is_finished():
+            ctx = self.ctx
+            main_view = ModActionView(ctx.target_user, ctx.moderation_manager, ctx.is_flagged_message,
+                                     ctx.flagged_message, ctx.message_url)
         
-        embed = discord.Embed(
-            title=f"🛡️ Moderation Actions - {self.target_user.display_name}",
-            description="Choose a moderation action to take",
-            color=discord.Color.blue()
-        )
+        embed = _render_embed(_MAIN_EMBED, self.ctx.display_name)
         
         await interaction.response.edit_message(embed=embed, view=main_view)
 
 class QuickWarnModal(discord.ui.Modal):
-    def __init__(self, target_user: discord.Member, moderation_manager, is_flagged_message: bool = False,
-                 flagged_message: str = "", message_url: str = ""):
+    def __init__(self, ctx: ModContext):
         super().__init__(title="Quick Warning")
-        self.target_user = target_user
-        self.moderation_manager = moderation_manager
-        self.is_flagged_message = is_flagged_message
-        self.flagged_message = flagged_message
-        self.message_url = message_url
+        self.ctx = ctx
 
         self.reason = discord.ui.TextInput(
             label="Warning Reason",
@@ -455,29 +476,20 @@ class QuickWarnModal(discord.ui.Modal):
             reason = self.reason.value
             
             # ✅ CORRECT: Using new case creation method
-            action_data = {
-                "action_type": "warn",
-                "reason": reason,
-                "severity": "Low",
-                "duration": None,
-                "dm_sent": False,
-                "moderator_name": interaction.user.display_name,
-                "display_name": self.target_user.display_name,
-                "username": self.target_user.name
-            }
-            
-            case_number = await self.moderation_manager.create_moderation_case(self.target_user.id, action_data)
+            action_data = _make_action_data("warn", reason, "Low", None, interaction.user, self.ctx.target_user)
+            
+            case_number = await self.ctx.moderation_manager.create_moderation_case(self.ctx.target_user.id, action_data)
             
             embed = discord.Embed(
                 title="✅ Quick Warning Issued",
-                description=f"Warning has been issued to {self.target_user.display_name}",
+                description=f"Warning has been issued to {self.ctx.display_name}",
                 color=discord.Color.green()
             )
             embed.add_field(name="Case Number", value=f"#{case_number}", inline=True)
             embed.add_field(name="Reason", value=reason, inline=False)
             
-            if self.is_flagged_message:
-                embed.add_field(name="🚨 Related to Flagged Message", value=self.flagged_message[:200], inline=False)
+            if self.ctx.is_flagged_message:
+                embed.add_field(name="🚨 Related to Flagged Message", value=self.ctx.flagged_message[:200], inline=False)
             
             await interaction.followup.send(embed=embed, ephemeral=True)
             
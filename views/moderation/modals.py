@@ -1,399 +1,422 @@
 # views/moderation/modals.py
+import asyncio
 import discord
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
+from discord.utils import utcnow
+
+_MINUTE = timedelta(minutes=1)
+# Accepted affirmative answers for the Yes/No inputs
+_YES = frozenset({"yes", "y", "true", "1"})
+
+# Discord caps member timeouts at 28 days
+MAX_TIMEOUT_MINUTES = 28 * 24 * 60
+# Discord only deletes up to a week of a banned member's messages
+MAX_DELETE_MESSAGE_DAYS = 7
+
+def _parse_bounded_int(value: str, lo: int, hi: int, default: Optional[int] = None) -> Optional[int]:
+    """Parse a whole number in [lo, hi] from a text input without raising.
+    
+    Blank input gives default; anything that is not plain digits or is out of range gives None.
+    """
+    value = (value or "").strip()
+    if not value:
+        return default
+    if not value.isdecimal():
+        return None
+    number = int(value)
+    return number if lo <= number <= hi else None
+
+# Channel permission edits a single silence keeps in flight at once
+MAX_CONCURRENT_PERMISSION_EDITS = 25
+
+async def _bulk_set_perms(guild: discord.Guild, member: discord.Member,
+                          overwrite: discord.PermissionOverwrite) -> Tuple[int, int]:
+    """Apply one overwrite for member on every text channel concurrently.
+    
+    Returns (channels updated, channels attempted); per-channel failures are counted, not raised.
+    """
+    slots = asyncio.Semaphore(MAX_CONCURRENT_PERMISSION_EDITS)
+    
+    async def set_one(channel):
+        async with slots:
+            await channel.set_permissions(member, overwrite=overwrite)
+    
+    results = await asyncio.gather(*(set_one(channel) for channel in guild.text_channels),
+                                   return_exceptions=True)
+    return sum(1 for r in results if not isinstance(r, Exception)), len(results)
+
+_DM_CONTACT_FIELD = {
+    "name": "Questions?",
+    "value": "If you have questions about this action, please contact the moderation team.",
+    "inline": False,
+}
+
+async def _try_dm(user: discord.Member, embed: discord.Embed) -> bool:
+    """DM a user, returning whether it was delivered (closed DMs are expected)"""
+    try:
+        await user.send(embed=embed)
+        return True
+    except discord.HTTPException:
+        return False
+
+def _is_yes(value: str, default: bool) -> bool:
+    """Interpret a Yes/No text input, falling back to default when left blank"""
+    answer = (value or "").strip().lower()
+    return answer in _YES if answer else default
+
+# Accepted severity spellings, keyed by lowercase input
+_SEVERITIES = {s.lower(): s for s in ("Low", "Medium", "High", "Critical")}
+
+def _normalize_severity(value: str, default: str) -> str:
+    """Map a severity text input onto a known level, falling back to default when blank or unknown"""
+    return _SEVERITIES.get((value or "").strip().lower(), default)
+
+def _internal_comment(placeholder: str) -> dict:
+    """TextInput kwargs for the required internal moderator comment"""
+    return dict(label="Internal Mod Comment", style=discord.TextStyle.paragraph,
+                placeholder=placeholder, required=True, max_length=1000)
+
+def _severity(default: str) -> dict:
+    """TextInput kwargs for the optional severity field, hinting at the given default"""
+    return dict(label="Severity (Low/Medium/High/Critical)", placeholder=default,
+                required=False, max_length=20)
+
+_USER_COMMENT = dict(label="Message to User (if sending DM)", style=discord.TextStyle.paragraph,
+                     placeholder="Enter message to send to user...", required=False, max_length=800)
+_SEND_DM = dict(label="Send DM to User? (Yes/No)", placeholder="Yes", required=False, max_length=3)
+
+# Strong references to case writes and followups still running in the background
+_pending_responses = set()
+
+# Background case writes allowed in flight at once across all modals
+MAX_CONCURRENT_CASE_WRITES = 50
+_CASE_WRITE_SLOTS = asyncio.Semaphore(MAX_CONCURRENT_CASE_WRITES)
+
+# Fixed part of every modal's confirmation embed
+_SUCCESS_EMBED = {
+    "title": "✅ Case Created Successfully",
+    "color": discord.Color.green().value,
+}
 
 class BaseModal(discord.ui.Modal):
     """Base class for moderation modals"""
     
+    _TITLE = "Moderation Action"
+    # Action name shown in the confirmation and error messages
+    _LABEL = "Action"
+    # Fixed case fields for this action; overridden by what the moderator entered
+    _DEFAULTS = {"duration": None, "dm_sent": False, "modstring_triggered": False}
+    # (attribute, TextInput kwargs) in display order; built into inputs per instance
+    _FIELDS = ()
+    # Colour of the notice DMed to the target
+    _DM_COLOR = discord.Color.orange().value
+    
     def __init__(self, target_user: discord.Member, moderation_manager, 
                  is_flagged_message: bool = False, flagged_message: str = "", 
-                 message_url: str = "", title: str = "Moderation Action"):
-        super().__init__(title=title)
+                 message_url: str = "", title: Optional[str] = None):
+        super().__init__(title=title or self._TITLE)
         self.target_user = target_user
+        # A modal lives for one interaction, so these can be resolved up front
+        self._display_name = target_user.display_name
+        self._username = target_user.name
+        self._avatar_url = target_user.display_avatar.url
         self.moderation_manager = moderation_manager
         self.is_flagged_message = is_flagged_message
         self.flagged_message = flagged_message
         self.message_url = message_url
+        self._flagged_or_none = flagged_message if is_flagged_message else None
+        self._flagged_preview = flagged_message[:300] if is_flagged_message and flagged_message else ""
+        
+        for attr, kwargs in self._FIELDS:
+            text_input = discord.ui.TextInput(**kwargs)
+            setattr(self, attr, text_input)
+            self.add_item(text_input)
+    
+    def _action_data(self, interaction: discord.Interaction, moderator_name: str, **fields) -> Dict[str, Any]:
+        """Case payload for this modal's action: class defaults plus the submitted values"""
+        return {
+            **self._DEFAULTS,
+            "moderator_id": interaction.user.id,
+            "moderator_name": moderator_name,
+            "display_name": self._display_name,
+            "username": self._username,
+            "flagged_message": self._flagged_or_none,
+            **fields
+        }
+    
+    async def _submit(self, interaction: discord.Interaction, reason: str, additional_info: str = "",
+                      enforce=None, concurrent: bool = False, dm_message: Optional[str] = None, **fields):
+        """Carry out this modal's action and file its case in the background.
+        
+        enforce is a zero-argument callable returning the Discord call that applies
+        the action. It runs after the case is filed unless concurrent is set.
+        dm_message, when given, is sent to the target once the action has been applied.
+        The interaction is already deferred, so on_submit returns without waiting on any of it.
+        """
+        task = asyncio.create_task(self._finalize(
+            interaction, interaction.user.display_name, reason, additional_info,
+            enforce, concurrent, dm_message, fields
+        ))
+        _pending_responses.add(task)
+        task.add_done_callback(_pending_responses.discard)
+    
+    async def _finalize(self, interaction: discord.Interaction, moderator_name: str, reason: str,
+                        additional_info: str, enforce, concurrent: bool, dm_message: Optional[str],
+                        fields: Dict[str, Any]):
+        """Apply the action, file the case and confirm; every failure is logged here"""
+        async with _CASE_WRITE_SLOTS:
+            try:
+                action_data = self._action_data(interaction, moderator_name, reason=reason, **fields)
+                create_case = self.moderation_manager.create_moderation_case(
+                    self.target_user.id, action_data, interaction.guild, interaction.client
+                )
+                
+                async def act() -> bool:
+                    if enforce is not None:
+                        await enforce()
+                    if dm_message is None:
+                        return False
+                    return await _try_dm(self.target_user, self._dm_embed(interaction.guild.name, dm_message))
+                
+                if enforce is None or concurrent:
+                    # Nothing about the case depends on the action or the DM, so both run at once
+                    dm_delivered, case_number = await asyncio.gather(act(), create_case, return_exceptions=True)
+                    if isinstance(case_number, Exception):
+                        raise case_number
+                    if isinstance(dm_delivered, Exception):
+                        # The case was filed for an action that never took effect
+                        self.moderation_manager.update_case(self.target_user.id, case_number, {"status": "Failed"})
+                        raise dm_delivered
+                else:
+                    case_number = await create_case
+                    try:
+                        dm_delivered = await act()
+                    except Exception:
+                        # Same as above: the filed case must not stay Open for an action that failed
+                        self.moderation_manager.update_case(self.target_user.id, case_number, {"status": "Failed"})
+                        raise
+                
+                if dm_message is not None and not dm_delivered:
+                    # The case was written assuming the DM would go out
+                    self.moderation_manager.update_case(self.target_user.id, case_number, {"dm_sent": False})
+                    additional_info = f"{additional_info}\n⚠️ DM could not be delivered".lstrip("\n")
+                
+                self._respond_later(self.send_success_response(
+                    interaction, self._LABEL, case_number, reason, additional_info, moderator_name
+                ))
+                
+            except Exception as e:
+                # Full detail goes to the log; the moderator gets a short, fixed-size notice
+                self.moderation_manager.logger.console_log_system(
+                    f"{self._LABEL} for user {self.target_user.id} by {interaction.user.id} failed: {e!r}", "ERROR"
+                )
+                self._respond_later(interaction.followup.send(
+                    f"❌ Error creating {self._LABEL.lower()}. The details have been logged.", ephemeral=True
+                ))
+    
+    def _dm_embed(self, guild_name: str, message: str) -> discord.Embed:
+        """The notice sent to the target about this action, with the moderators' message when there is one"""
+        fields = [{"name": "Message from the moderators", "value": message, "inline": False}] if message else []
+        fields.append(dict(_DM_CONTACT_FIELD))
+        return discord.Embed.from_dict({
+            "title": f"Moderation Action: {self._LABEL}",
+            "description": f"You have received a {self._LABEL.lower()} in {guild_name}",
+            "color": self._DM_COLOR,
+            "fields": fields,
+        })
+    
+    def _respond_later(self, coro):
+        """Send a followup in the background so on_submit returns without waiting on the webhook"""
+        async def deliver():
+            try:
+                await coro
+            except discord.HTTPException as e:
+                self.moderation_manager.logger.console_log_system(f"Error sending modal response: {e}", "ERROR")
+        
+        task = asyncio.create_task(deliver())
+        _pending_responses.add(task)
+        task.add_done_callback(_pending_responses.discard)
     
     async def send_success_response(self, interaction: discord.Interaction, 
                                   action_type: str, case_number: int, 
-                                  reason: str, additional_info: str = ""):
+                                  reason: str, additional_info: str = "",
+                                  moderator_name: Optional[str] = None):
         """Send success response after case creation"""
-        embed = discord.Embed(
-            title="✅ Case Created Successfully",
-            description=f"Case #{case_number} has been created for {self.target_user.display_name}",
-            color=discord.Color.green()
-        )
-        
-        embed.add_field(name="Action", value=action_type.title(), inline=True)
-        embed.add_field(name="Moderator", value=interaction.user.display_name, inline=True)
+        fields = [
+            {"name": "Action", "value": action_type.title(), "inline": True},
+            {"name": "Moderator", "value": moderator_name or interaction.user.display_name, "inline": True},
+        ]
         
         if additional_info:
-            embed.add_field(name="Details", value=additional_info, inline=True)
+            fields.append({"name": "Details", "value": additional_info, "inline": True})
         
-        embed.add_field(name="Reason", value=reason, inline=False)
+        fields.append({"name": "Reason", "value": reason, "inline": False})
         
         if self.is_flagged_message:
-            embed.add_field(name="🚨 Flagged Message", value=self.flagged_message[:300], inline=False)
+            fields.append({"name": "🚨 Flagged Message", "value": self._flagged_preview, "inline": False})
             if self.message_url:
-                embed.add_field(name="🔗 Original Message", value=f"[Jump to Message]({self.message_url})", inline=False)
+                fields.append({"name": "🔗 Original Message", "value": f"[Jump to Message]({self.message_url})", "inline": False})
         
-        embed.set_thumbnail(url=self.target_user.display_avatar.url)
+        embed = discord.Embed.from_dict({
+            **_SUCCESS_EMBED,
+            "description": f"Case #{case_number} has been created for {self._display_name}",
+            "thumbnail": {"url": self._avatar_url},
+            "fields": fields,
+        })
         
         await interaction.followup.send(embed=embed)
 
 class WarnModal(BaseModal):
-    def __init__(self, target_user: discord.Member, moderation_manager, 
-                 is_flagged_message: bool = False, flagged_message: str = "", 
-                 message_url: str = ""):
-        super().__init__(target_user, moderation_manager, is_flagged_message, 
-                        flagged_message, message_url, "Warn User")
-        
-        self.internal_comment = discord.ui.TextInput(
-            label="Internal Mod Comment",
-            style=discord.TextStyle.paragraph,
-            placeholder="Enter internal notes about this warning...",
-            required=True,
-            max_length=1000
-        )
-        
-        self.user_comment = discord.ui.TextInput(
-            label="Message to User (if sending DM)",
-            style=discord.TextStyle.paragraph,
-            placeholder="Enter message to send to user...",
-            required=False,
-            max_length=800
-        )
-        
-        self.send_dm = discord.ui.TextInput(
-            label="Send DM to User? (Yes/No)",
-            placeholder="Yes",
-            required=False,
-            max_length=3
-        )
-        
-        self.severity = discord.ui.TextInput(
-            label="Severity (Low/Medium/High/Critical)",
-            placeholder="Medium",
-            required=False,
-            max_length=20
-        )
-        
-        self.add_item(self.internal_comment)
-        self.add_item(self.user_comment)
-        self.add_item(self.send_dm)
-        self.add_item(self.severity)
+    _TITLE = "Warn User"
+    _LABEL = "Warning"
+    _DEFAULTS = {**BaseModal._DEFAULTS, "action_type": "warn"}
+    _FIELDS = (
+        ("internal_comment", _internal_comment("Enter internal notes about this warning...")),
+        ("user_comment", _USER_COMMENT),
+        ("send_dm", _SEND_DM),
+        ("severity", _severity("Medium")),
+    )
     
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer()
         
-        try:
-            severity = self.severity.value if self.severity.value else "Medium"
-            send_dm = self.send_dm.value.lower() == "yes" if self.send_dm.value else True
-            internal_comment = self.internal_comment.value
-            user_comment = self.user_comment.value if self.user_comment.value else internal_comment
-            
-            # FIXED: Use new async case creation method with guild and bot
-            action_data = {
-                "action_type": "warn",
-                "reason": internal_comment,
-                "severity": severity,
-                "duration": None,
-                "dm_sent": send_dm,
-                "moderator_id": interaction.user.id,
-                "moderator_name": interaction.user.display_name,
-                "display_name": self.target_user.display_name,
-                "username": self.target_user.name,
-                "user_comment": user_comment,
-                "flagged_message": self.flagged_message if self.is_flagged_message else None,
-                "modstring_triggered": False
-            }
-            
-            case_number = await self.moderation_manager.create_moderation_case(
-                self.target_user.id, action_data, interaction.guild, interaction.client
-            )
-            
-            await self.send_success_response(
-                interaction, "Warning", case_number, internal_comment,
-                f"DM Sent: {'✅' if send_dm else '❌'}"
-            )
-            
-        except Exception as e:
-            await interaction.followup.send(f"❌ Error creating warning: {str(e)}", ephemeral=True)
+        send_dm = _is_yes(self.send_dm.value, default=True)
+        internal_comment = self.internal_comment.value
+        # The internal note never goes to the user; without a typed message they get a plain notice
+        user_comment = (self.user_comment.value or "").strip()
+        await self._submit(
+            interaction, internal_comment, f"DM Sent: {'✅' if send_dm else '❌'}",
+            dm_message=user_comment if send_dm else None,
+            severity=_normalize_severity(self.severity.value, "Medium"),
+            dm_sent=send_dm,
+            user_comment=user_comment
+        )
 
 class TimeoutModal(BaseModal):
-    def __init__(self, target_user: discord.Member, moderation_manager, 
-                 is_flagged_message: bool = False, flagged_message: str = "", 
-                 message_url: str = ""):
-        super().__init__(target_user, moderation_manager, is_flagged_message, 
-                        flagged_message, message_url, "Timeout User")
-        
-        self.duration = discord.ui.TextInput(
-            label="Duration (minutes)",
-            placeholder="60",
-            required=True,
-            max_length=6
-        )
-        
-        self.internal_comment = discord.ui.TextInput(
-            label="Internal Mod Comment",
-            style=discord.TextStyle.paragraph,
-            placeholder="Enter internal notes about this timeout...",
-            required=True,
-            max_length=1000
-        )
-        
-        self.user_comment = discord.ui.TextInput(
-            label="Message to User (if sending DM)",
-            style=discord.TextStyle.paragraph,
-            placeholder="Enter message to send to user...",
-            required=False,
-            max_length=800
-        )
-        
-        self.send_dm = discord.ui.TextInput(
-            label="Send DM to User? (Yes/No)",
-            placeholder="Yes",
-            required=False,
-            max_length=3
-        )
-        
-        self.add_item(self.duration)
-        self.add_item(self.internal_comment)
-        self.add_item(self.user_comment)
-        self.add_item(self.send_dm)
+    _TITLE = "Timeout User"
+    _LABEL = "Timeout"
+    _DEFAULTS = {**BaseModal._DEFAULTS, "action_type": "timeout", "severity": "Medium"}
+    _FIELDS = (
+        ("duration", dict(label="Duration (minutes)", placeholder="60", required=True, max_length=6)),
+        ("internal_comment", _internal_comment("Enter internal notes about this timeout...")),
+        ("user_comment", _USER_COMMENT),
+        ("send_dm", _SEND_DM),
+    )
     
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer()
         
-        try:
-            duration = int(self.duration.value)
-            send_dm = self.send_dm.value.lower() == "yes" if self.send_dm.value else True
-            internal_comment = self.internal_comment.value
-            user_comment = self.user_comment.value if self.user_comment.value else internal_comment
-            
-            # Apply the timeout
-            timeout_until = datetime.now() + timedelta(minutes=duration)
-            await self.target_user.timeout(timeout_until, reason=internal_comment)
-            
-            # FIXED: Use new async case creation method with guild and bot
-            action_data = {
-                "action_type": "timeout",
-                "reason": internal_comment,
-                "severity": "Medium",
-                "duration": duration,
-                "dm_sent": send_dm,
-                "moderator_id": interaction.user.id,
-                "moderator_name": interaction.user.display_name,
-                "display_name": self.target_user.display_name,
-                "username": self.target_user.name,
-                "user_comment": user_comment,
-                "flagged_message": self.flagged_message if self.is_flagged_message else None,
-                "modstring_triggered": False
-            }
-            
-            case_number = await self.moderation_manager.create_moderation_case(
-                self.target_user.id, action_data, interaction.guild, interaction.client
-            )
-            
-            await self.send_success_response(
-                interaction, "Timeout", case_number, internal_comment,
-                f"Duration: {duration} minutes"
-            )
-            
-        except Exception as e:
-            await interaction.followup.send(f"❌ Error creating timeout: {str(e)}", ephemeral=True)
-
-class KickModal(BaseModal):
-    def __init__(self, target_user: discord.Member, moderation_manager, 
-                 is_flagged_message: bool = False, flagged_message: str = "", 
-                 message_url: str = ""):
-        super().__init__(target_user, moderation_manager, is_flagged_message, 
-                        flagged_message, message_url, "Kick User")
-        
-        self.internal_comment = discord.ui.TextInput(
-            label="Internal Mod Comment",
-            style=discord.TextStyle.paragraph,
-            placeholder="Enter internal notes about this kick...",
-            required=True,
-            max_length=1000
-        )
+        duration = _parse_bounded_int(self.duration.value, 1, MAX_TIMEOUT_MINUTES)
+        if duration is None:
+            self._respond_later(interaction.followup.send(
+                f"❌ Duration must be a whole number of minutes between 1 and {MAX_TIMEOUT_MINUTES}.", ephemeral=True
+            ))
+            return
         
-        self.severity = discord.ui.TextInput(
-            label="Severity (Low/Medium/High/Critical)",
-            placeholder="High",
-            required=False,
-            max_length=20
+        send_dm = _is_yes(self.send_dm.value, default=True)
+        internal_comment = self.internal_comment.value
+        # The internal note never goes to the user; without a typed message they get a plain notice
+        user_comment = (self.user_comment.value or "").strip()
+        timeout_until = utcnow() + _MINUTE * duration
+        await self._submit(
+            interaction, internal_comment, f"Duration: {duration} minutes",
+            enforce=lambda: self.target_user.timeout(timeout_until, reason=internal_comment),
+            concurrent=True,
+            dm_message=user_comment if send_dm else None,
+            duration=duration,
+            dm_sent=send_dm,
+            user_comment=user_comment
         )
-        
-        self.add_item(self.internal_comment)
-        self.add_item(self.severity)
+
+class KickModal(BaseModal):
+    _TITLE = "Kick User"
+    _LABEL = "Kick"
+    _DEFAULTS = {**BaseModal._DEFAULTS, "action_type": "kick"}
+    _FIELDS = (
+        ("internal_comment", _internal_comment("Enter internal notes about this kick...")),
+        ("severity", _severity("High")),
+    )
     
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer()
         
-        try:
-            severity = self.severity.value if self.severity.value else "High"
-            internal_comment = self.internal_comment.value
-            
-            # FIXED: Use new async case creation method with guild and bot
-            action_data = {
-                "action_type": "kick",
-                "reason": internal_comment,
-                "severity": severity,
-                "duration": None,
-                "dm_sent": False,
-                "moderator_id": interaction.user.id,
-                "moderator_name": interaction.user.display_name,
-                "display_name": self.target_user.display_name,
-                "username": self.target_user.name,
-                "flagged_message": self.flagged_message if self.is_flagged_message else None,
-                "modstring_triggered": False
-            }
-            
-            case_number = await self.moderation_manager.create_moderation_case(
-                self.target_user.id, action_data, interaction.guild, interaction.client
-            )
-            
+        internal_comment = self.internal_comment.value
+        await self._submit(
+            interaction, internal_comment,
             # Kick the user after creating the case
-            await self.target_user.kick(reason=internal_comment)
-            
-            await self.send_success_response(
-                interaction, "Kick", case_number, internal_comment
-            )
-            
-        except Exception as e:
-            await interaction.followup.send(f"❌ Error creating kick: {str(e)}", ephemeral=True)
+            enforce=lambda: self.target_user.kick(reason=internal_comment),
+            severity=_normalize_severity(self.severity.value, "High")
+        )
 
 class BanModal(BaseModal):
-    def __init__(self, target_user: discord.Member, moderation_manager, 
-                 is_flagged_message: bool = False, flagged_message: str = "", 
-                 message_url: str = ""):
-        super().__init__(target_user, moderation_manager, is_flagged_message, 
-                        flagged_message, message_url, "Ban User")
-        
-        self.internal_comment = discord.ui.TextInput(
-            label="Internal Mod Comment",
-            style=discord.TextStyle.paragraph,
-            placeholder="Enter internal notes about this ban...",
-            required=True,
-            max_length=1000
-        )
-        
-        self.delete_days = discord.ui.TextInput(
-            label="Delete Messages (days 0-7)",
-            placeholder="1",
-            required=False,
-            max_length=1
-        )
-        
-        self.add_item(self.internal_comment)
-        self.add_item(self.delete_days)
+    _TITLE = "Ban User"
+    _LABEL = "Ban"
+    _DEFAULTS = {**BaseModal._DEFAULTS, "action_type": "ban", "severity": "Critical"}
+    _FIELDS = (
+        ("internal_comment", _internal_comment("Enter internal notes about this ban...")),
+        ("delete_days", dict(label="Delete Messages (days 0-7)", placeholder="1", required=False, max_length=1)),
+    )
     
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer()
         
-        try:
-            internal_comment = self.internal_comment.value
-            delete_days = int(self.delete_days.value) if self.delete_days.value else 1
-            delete_days = max(0, min(delete_days, 7))  # Clamp between 0-7
-            
-            # FIXED: Use new async case creation method with guild and bot
-            action_data = {
-                "action_type": "ban",
-                "reason": internal_comment,
-                "severity": "Critical",
-                "duration": None,
-                "dm_sent": False,
-                "moderator_id": interaction.user.id,
-                "moderator_name": interaction.user.display_name,
-                "display_name": self.target_user.display_name,
-                "username": self.target_user.name,
-                "flagged_message": self.flagged_message if self.is_flagged_message else None,
-                "modstring_triggered": False
-            }
-            
-            case_number = await self.moderation_manager.create_moderation_case(
-                self.target_user.id, action_data, interaction.guild, interaction.client
-            )
-            
+        delete_days = _parse_bounded_int(self.delete_days.value, 0, MAX_DELETE_MESSAGE_DAYS, default=1)
+        if delete_days is None:
+            self._respond_later(interaction.followup.send(
+                f"❌ Delete Messages must be a number of days from 0 to {MAX_DELETE_MESSAGE_DAYS}.", ephemeral=True
+            ))
+            return
+        
+        internal_comment = self.internal_comment.value
+        await self._submit(
+            interaction, internal_comment, f"Messages deleted: {delete_days} days",
             # Ban the user after creating the case
-            await self.target_user.ban(reason=internal_comment, delete_message_days=delete_days)
-            
-            await self.send_success_response(
-                interaction, "Ban", case_number, internal_comment,
-                f"Messages deleted: {delete_days} days"
-            )
-            
-        except Exception as e:
-            await interaction.followup.send(f"❌ Error creating ban: {str(e)}", ephemeral=True)
+            enforce=lambda: self.target_user.ban(reason=internal_comment, delete_message_days=delete_days)
+        )
 
 class ModNoteModal(BaseModal):
-    def __init__(self, target_user: discord.Member, moderation_manager, 
-                 is_flagged_message: bool = False, flagged_message: str = "", 
-                 message_url: str = ""):
-        super().__init__(target_user, moderation_manager, is_flagged_message, 
-                        flagged_message, message_url, "Add Mod Note")
-        
-        self.internal_comment = discord.ui.TextInput(
-            label="Internal Mod Comment",
-            style=discord.TextStyle.paragraph,
-            placeholder="Enter internal notes...",
-            required=True,
-            max_length=1000
-        )
-        
-        self.resolvable = discord.ui.TextInput(
-            label="Resolvable? (Yes/No)",
-            placeholder="No",
-            required=False,
-            max_length=3
-        )
+    _TITLE = "Add Mod Note"
+    _LABEL = "Mod Note"
+    _DEFAULTS = {**BaseModal._DEFAULTS, "action_type": "mod_note"}
+    _FIELDS = (
+        ("internal_comment", _internal_comment("Enter internal notes...")),
+        ("resolvable", dict(label="Resolvable? (Yes/No)", placeholder="No", required=False, max_length=3)),
+        ("severity", _severity("Low")),
+    )
+    
+    async def on_submit(self, interaction: discord.Interaction):
+        await interaction.response.defer()
         
-        self.severity = discord.ui.TextInput(
-            label="Severity (Low/Medium/High/Critical)",
-            placeholder="Low",
-            required=False,
-            max_length=20
+        resolvable = "Yes" if _is_yes(self.resolvable.value, default=False) else "No"
+        await self._submit(
+            interaction, self.internal_comment.value, f"Resolvable: {resolvable}",
+            severity=_normalize_severity(self.severity.value, "Low"),
+            resolvable=resolvable
         )
-        
-        self.add_item(self.internal_comment)
-        self.add_item(self.resolvable)
-        self.add_item(self.severity)
+
+class SilenceModal(BaseModal):
+    _TITLE = "Silence User"
+    _LABEL = "Silence"
+    _DEFAULTS = {**BaseModal._DEFAULTS, "action_type": "silence"}
+    _FIELDS = (
+        ("internal_comment", _internal_comment("Enter internal notes about this silence...")),
+        ("severity", _severity("Medium")),
+    )
+    # Shared by every channel and every submit; set_permissions only serialises it
+    _OVERWRITE = discord.PermissionOverwrite(send_messages=False, add_reactions=False)
     
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer()
         
-        try:
-            severity = self.severity.value if self.severity.value else "Low"
-            resolvable = "Yes" if self.resolvable.value.lower() == "yes" else "No"
-            internal_comment = self.internal_comment.value
-            
-            # FIXED: Use new async case creation method with guild and bot
-            action_data = {
-                "action_type": "mod_note",
-                "reason": internal_comment,
-                "severity": severity,
-                "duration": None,
-                "dm_sent": False,
-                "moderator_id": interaction.user.id,
-                "moderator_name": interaction.user.display_name,
-                "display_name": self.target_user.display_name,
-                "username": self.target_user.name,
-                "resolvable": resolvable,
-                "flagged_message": self.flagged_message if self.is_flagged_message else None,
-                "modstring_triggered": False
-            }
-            
-            case_number = await self.moderation_manager.create_moderation_case(
-                self.target_user.id, action_data, interaction.guild, interaction.client
-            )
-            
-            await self.send_success_response(
-                interaction, "Mod Note", case_number, internal_comment,
-                f"Resolvable: {resolvable}"
-            )
-            
-        except Exception as e:
-            await interaction.followup.send(f"❌ Error creating mod note: {str(e)}", ephemeral=True)
\ No newline at end of file
+        updated, total = await _bulk_set_perms(interaction.guild, self.target_user, self._OVERWRITE)
+        if not updated:
+            self._respond_later(interaction.followup.send(
+                "❌ Could not update any channel permissions. Check bot permissions.", ephemeral=True
+            ))
+            return
+        
+        await self._submit(
+            interaction, self.internal_comment.value, f"Channels silenced: {updated}/{total}",
+            severity=_normalize_severity(self.severity.value, "Medium")
+        )
@@ -1,7 +1,37 @@
 # views/psychosis_views.py
 import discord
-from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from managers.psychosis import pretty_restriction_name
+
+# Longest comment excerpt shown in a confirmation embed field
+EMBED_PREVIEW_CHARS = 500
+
+def _parse_minutes(value: str) -> Optional[int]:
+    """Parse a whole number of minutes from a text input; None unless it is plain digits"""
+    value = (value or "").strip()
+    return int(value) if value.isdecimal() else None
+
+def _add_inputs(modal: discord.ui.Modal, fields) -> None:
+    """Create the modal's TextInputs from (attribute, kwargs) specs and add them in order"""
+    for attr, kwargs in fields:
+        text_input = discord.ui.TextInput(**kwargs)
+        setattr(modal, attr, text_input)
+        modal.add_item(text_input)
+
+# Fixed parts of the confirmation embeds; only description and fields vary per call
+_APPLIED_EMBED = {"title": "✅ Psychosis Restriction Applied", "color": discord.Color.green().value}
+_REMOVED_EMBED = {"title": "✅ Psychosis Restriction Removed", "color": discord.Color.green().value}
+_EXTENDED_EMBED = {"title": "✅ Psychosis Restriction Extended", "color": discord.Color.yellow().value}
+_CANCELLED_EMBED = {"title": "❌ Action Cancelled", "color": discord.Color.red().value}
+
+# The cancel replies never change, and sending only serialises an embed, so one instance each is shared
+_CANCEL_NEW_ACTION = discord.Embed.from_dict({
+    **_CANCELLED_EMBED, "description": "Psychosis management action has been cancelled."
+})
+_CANCEL_EXISTING = discord.Embed.from_dict({
+    **_CANCELLED_EMBED, "description": "No changes made to existing restriction."
+})
 
 class PsychosisActionView(discord.ui.View):
     def __init__(self, target_user: discord.Member, psychosis_manager):
@@ -9,34 +39,29 @@ class PsychosisActionView(discord.ui.View):
         self.target_user = target_user
         self.psychosis_manager = psychosis_manager
 
+    async def _send_modal(self, interaction: discord.Interaction, restriction_type: str):
+        """Open the apply modal for the chosen restriction type"""
+        await interaction.response.send_modal(PsychosisModal(self.target_user, self.psychosis_manager, restriction_type))
+
     @discord.ui.button(label="Silence (Text)", style=discord.ButtonStyle.secondary, emoji="🔇")
     async def silence_action(self, interaction: discord.Interaction, button: discord.ui.Button):
-        modal = PsychosisModal(self.target_user, self.psychosis_manager, "silence")
-        await interaction.response.send_modal(modal)
+        await self._send_modal(interaction, "silence")
 
     @discord.ui.button(label="Voice Timeout", style=discord.ButtonStyle.secondary, emoji="🎤")
     async def voice_timeout_action(self, interaction: discord.Interaction, button: discord.ui.Button):
-        modal = PsychosisModal(self.target_user, self.psychosis_manager, "voice_timeout")
-        await interaction.response.send_modal(modal)
+        await self._send_modal(interaction, "voice_timeout")
 
     @discord.ui.button(label="Full Restriction", style=discord.ButtonStyle.danger, emoji="🔒")
     async def full_restriction_action(self, interaction: discord.Interaction, button: discord.ui.Button):
-        modal = PsychosisModal(self.target_user, self.psychosis_manager, "full_restriction")
-        await interaction.response.send_modal(modal)
+        await self._send_modal(interaction, "full_restriction")
 
     @discord.ui.button(label="Isolation", style=discord.ButtonStyle.danger, emoji="🧠")
     async def isolation_action(self, interaction: discord.Interaction, button: discord.ui.Button):
-        modal = PsychosisModal(self.target_user, self.psychosis_manager, "isolation")
-        await interaction.response.send_modal(modal)
+        await self._send_modal(interaction, "isolation")
 
     @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary, emoji="❌")
     async def cancel_action(self, interaction: discord.Interaction, button: discord.ui.Button):
-        embed = discord.Embed(
-            title="❌ Action Cancelled",
-            description="Psychosis management action has been cancelled.",
-            color=discord.Color.red()
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_CANCEL_NEW_ACTION, ephemeral=True)
 
 class ExistingRestrictionView(discord.ui.View):
     def __init__(self, target_user: discord.Member, restriction_data: Dict[str, Any], psychosis_manager):
@@ -57,112 +82,109 @@ class ExistingRestrictionView(discord.ui.View):
 
     @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary, emoji="❌")
     async def cancel_action(self, interaction: discord.Interaction, button: discord.ui.Button):
-        embed = discord.Embed(
-            title="❌ Action Cancelled",
-            description="No changes made to existing restriction.",
-            color=discord.Color.red()
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_CANCEL_EXISTING, ephemeral=True)
 
 class PsychosisModal(discord.ui.Modal):
+    # (attribute, TextInput kwargs) in display order; built into inputs per instance
+    _FIELDS = (
+        ("duration", dict(label="Duration (minutes)", placeholder="60", required=True, max_length=10)),
+        ("user_comment", dict(label="Message to User (Public in psychosis channel)", style=discord.TextStyle.paragraph,
+                              placeholder="Supportive message that will be posted in the psychosis channel...",
+                              required=False, max_length=1000)),
+        ("mod_comment", dict(label="Internal Mod Notes", style=discord.TextStyle.paragraph,
+                             placeholder="Internal notes about this restriction...", required=True, max_length=1000)),
+    )
+
     def __init__(self, target_user: discord.Member, psychosis_manager, restriction_type: str):
-        super().__init__(title=f"Apply {restriction_type.replace('_', ' ').title()}")
-        self.target_user = target_user
+        pretty_type = pretty_restriction_name(restriction_type)
+        super().__init__(title=f"Apply {pretty_type}")
+        # Only the id and name are kept; the Member is looked up again if it is needed
+        self.target_user_id = target_user.id
+        self.target_display_name = target_user.display_name
         self.psychosis_manager = psychosis_manager
         self.restriction_type = restriction_type
+        self._pretty_type = pretty_type
 
-        self.duration = discord.ui.TextInput(
-            label="Duration (minutes)",
-            placeholder="60",
-            required=True,
-            max_length=10
-        )
-
-        self.user_comment = discord.ui.TextInput(
-            label="Message to User (Public in psychosis channel)",
-            style=discord.TextStyle.paragraph,
-            placeholder="Supportive message that will be posted in the psychosis channel...",
-            required=False,
-            max_length=1000
-        )
-
-        self.mod_comment = discord.ui.TextInput(
-            label="Internal Mod Notes",
-            style=discord.TextStyle.paragraph,
-            placeholder="Internal notes about this restriction...",
-            required=True,
-            max_length=1000
-        )
-
-        self.add_item(self.duration)
-        self.add_item(self.user_comment)
-        self.add_item(self.mod_comment)
+        _add_inputs(self, self._FIELDS)
 
     async def on_submit(self, interaction: discord.Interaction):
+        # Validate before deferring so a rejected duration is answered in one call
+        duration_minutes = _parse_minutes(self.duration.value)
+        if duration_minutes is None:
+            await interaction.response.send_message("❌ Invalid duration. Please enter a number.", ephemeral=True)
+            return
+        if duration_minutes <= 0:
+            await interaction.response.send_message("❌ Duration must be greater than 0.", ephemeral=True)
+            return
+
+        target_user = interaction.guild.get_member(self.target_user_id)
+        if target_user is None:
+            await interaction.response.send_message("❌ That member is no longer in the server.", ephemeral=True)
+            return
+
+        # Applying permissions across the guild can outlast the 3 second response window
         await interaction.response.defer()
 
-        try:
-            # Validate duration
-            try:
-                duration_minutes = int(self.duration.value)
-                if duration_minutes <= 0:
-                    await interaction.followup.send("❌ Duration must be greater than 0.", ephemeral=True)
-                    return
-            except ValueError:
-                await interaction.followup.send("❌ Invalid duration. Please enter a number.", ephemeral=True)
-                return
+        user_comment = self.user_comment.value
+        mod_comment = self.mod_comment.value
 
+        try:
             # Apply the restriction
             success = await self.psychosis_manager.apply_restriction(
                 interaction.client,
                 interaction.guild,
-                self.target_user,
+                target_user,
                 self.restriction_type,
                 duration_minutes,
                 interaction.user,
-                self.user_comment.value,
-                self.mod_comment.value
+                user_comment,
+                mod_comment
             )
 
             if success:
-                embed = discord.Embed(
-                    title="✅ Psychosis Restriction Applied",
-                    description=f"{self.restriction_type.replace('_', ' ').title()} restriction has been applied to {self.target_user.display_name}",
-                    color=discord.Color.green()
-                )
+                fields = [
+                    {"name": "Duration", "value": f"{duration_minutes} minutes", "inline": True},
+                    {"name": "Type", "value": self._pretty_type, "inline": True},
+                    {"name": "Applied By", "value": interaction.user.display_name, "inline": True},
+                ]
 
-                embed.add_field(name="Duration", value=f"{duration_minutes} minutes", inline=True)
-                embed.add_field(name="Type", value=self.restriction_type.replace('_', ' ').title(), inline=True)
-                embed.add_field(name="Applied By", value=interaction.user.display_name, inline=True)
+                # The manager keeps the full comments; only the confirmation is shortened
+                if user_comment:
+                    fields.append({"name": "Public Message", "value": user_comment[:EMBED_PREVIEW_CHARS], "inline": False})
 
-                if self.user_comment.value:
-                    embed.add_field(name="Public Message", value=self.user_comment.value[:500], inline=False)
+                fields.append({"name": "Internal Notes", "value": mod_comment[:EMBED_PREVIEW_CHARS], "inline": False})
 
-                embed.add_field(name="Internal Notes", value=self.mod_comment.value[:500], inline=False)
+                embed = discord.Embed.from_dict({
+                    **_APPLIED_EMBED,
+                    "description": f"{self._pretty_type} restriction has been applied to {self.target_display_name}",
+                    "fields": fields
+                })
 
                 await interaction.followup.send(embed=embed)
             else:
                 await interaction.followup.send("❌ Failed to apply psychosis restriction. Check bot permissions.", ephemeral=True)
 
         except Exception as e:
-            await interaction.followup.send(f"❌ Error applying restriction: {str(e)}", ephemeral=True)
+            # Full detail goes to the log; the moderator gets a short, fixed notice
+            self.psychosis_manager.logger.console_log_system(
+                f"Error applying restriction for user {self.target_user_id}: {e!r}", "ERROR"
+            )
+            await interaction.followup.send("❌ Error applying restriction. The details have been logged.", ephemeral=True)
 
 class RemoveRestrictionModal(discord.ui.Modal):
+    _FIELDS = (
+        ("reason", dict(label="Reason for Removal", style=discord.TextStyle.paragraph,
+                        placeholder="Why is this restriction being removed early?", required=True, max_length=500)),
+    )
+
     def __init__(self, target_user: discord.Member, restriction_data: Dict[str, Any], psychosis_manager):
         super().__init__(title="Remove Psychosis Restriction")
-        self.target_user = target_user
+        self.target_user_id = target_user.id
+        self.target_display_name = target_user.display_name
         self.restriction_data = restriction_data
         self.psychosis_manager = psychosis_manager
 
-        self.reason = discord.ui.TextInput(
-            label="Reason for Removal",
-            style=discord.TextStyle.paragraph,
-            placeholder="Why is this restriction being removed early?",
-            required=True,
-            max_length=500
-        )
-
-        self.add_item(self.reason)
+        _add_inputs(self, self._FIELDS)
 
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer()
@@ -170,93 +192,85 @@ class RemoveRestrictionModal(discord.ui.Modal):
         try:
             success = await self.psychosis_manager.remove_restriction(
                 interaction.client,
-                self.target_user.id,
-                f"Manual removal by {interaction.user.display_name}: {self.reason.value}"
+                self.target_user_id,
+                # A mention stays correct in the log and mod channel if the moderator is renamed;
+                # the user's DM can't resolve mentions, so it gets the display name
+                f"Manual removal by {interaction.user.mention}: {self.reason.value}",
+                user_reason=f"Manual removal by {interaction.user.display_name}: {self.reason.value}"
             )
 
             if success:
-                embed = discord.Embed(
-                    title="✅ Psychosis Restriction Removed",
-                    description=f"Restriction has been removed from {self.target_user.display_name}",
-                    color=discord.Color.green()
-                )
-
-                embed.add_field(name="Removed By", value=interaction.user.display_name, inline=True)
-                embed.add_field(name="Reason", value=self.reason.value, inline=False)
+                embed = discord.Embed.from_dict({
+                    **_REMOVED_EMBED,
+                    "description": f"Restriction has been removed from {self.target_display_name}",
+                    "fields": [
+                        {"name": "Removed By", "value": interaction.user.display_name, "inline": True},
+                        {"name": "Reason", "value": self.reason.value, "inline": False},
+                    ]
+                })
 
                 await interaction.followup.send(embed=embed)
             else:
                 await interaction.followup.send("❌ Failed to remove psychosis restriction.", ephemeral=True)
 
         except Exception as e:
-            await interaction.followup.send(f"❌ Error removing restriction: {str(e)}", ephemeral=True)
+            # Full detail goes to the log; the moderator gets a short, fixed notice
+            self.psychosis_manager.logger.console_log_system(
+                f"Error removing restriction for user {self.target_user_id}: {e!r}", "ERROR"
+            )
+            await interaction.followup.send("❌ Error removing restriction. The details have been logged.", ephemeral=True)
 
 class ExtendRestrictionModal(discord.ui.Modal):
+    _FIELDS = (
+        ("additional_minutes", dict(label="Additional Minutes", placeholder="30", required=True, max_length=10)),
+        ("reason", dict(label="Reason for Extension", style=discord.TextStyle.paragraph,
+                        placeholder="Why is this restriction being extended?", required=True, max_length=500)),
+    )
+
     def __init__(self, target_user: discord.Member, restriction_data: Dict[str, Any], psychosis_manager):
         super().__init__(title="Extend Psychosis Restriction")
-        self.target_user = target_user
-        self.restriction_data = restriction_data
+        self.target_user_id = target_user.id
+        self.target_display_name = target_user.display_name
+        # The manager owns the live record, so the snapshot this modal was opened with is not kept
         self.psychosis_manager = psychosis_manager
 
-        self.additional_minutes = discord.ui.TextInput(
-            label="Additional Minutes",
-            placeholder="30",
-            required=True,
-            max_length=10
-        )
-
-        self.reason = discord.ui.TextInput(
-            label="Reason for Extension",
-            style=discord.TextStyle.paragraph,
-            placeholder="Why is this restriction being extended?",
-            required=True,
-            max_length=500
-        )
-
-        self.add_item(self.additional_minutes)
-        self.add_item(self.reason)
+        _add_inputs(self, self._FIELDS)
 
     async def on_submit(self, interaction: discord.Interaction):
-        await interaction.response.defer()
+        # Extending only touches local state, so every outcome is sent as the direct response
+        additional_minutes = _parse_minutes(self.additional_minutes.value)
+        if additional_minutes is None:
+            await interaction.response.send_message("❌ Invalid duration. Please enter a number.", ephemeral=True)
+            return
+        if additional_minutes <= 0:
+            await interaction.response.send_message("❌ Additional minutes must be greater than 0.", ephemeral=True)
+            return
 
         try:
-            # Validate additional minutes
-            try:
-                additional_minutes = int(self.additional_minutes.value)
-                if additional_minutes <= 0:
-                    await interaction.followup.send("❌ Additional minutes must be greater than 0.", ephemeral=True)
-                    return
-            except ValueError:
-                await interaction.followup.send("❌ Invalid duration. Please enter a number.", ephemeral=True)
-                return
-
-            # Update restriction data
-            current_duration = self.restriction_data.get("duration_minutes", 0)
-            new_duration = current_duration + additional_minutes
-            
-            self.restriction_data["duration_minutes"] = new_duration
-            self.psychosis_manager.add_user_restriction(self.target_user.id, self.restriction_data)
-
-            # Restart timer with new duration
-            await self.psychosis_manager.timer_manager.start_restriction_timer(
-                interaction.client,
-                self.target_user.id,
-                self.restriction_data.get("type", "unknown"),
-                additional_minutes  # Only extend by the additional time
-            )
-
-            embed = discord.Embed(
-                title="✅ Psychosis Restriction Extended",
-                description=f"Restriction for {self.target_user.display_name} has been extended",
-                color=discord.Color.yellow()
+            # Update the stored restriction and its timer in one step
+            new_duration = await self.psychosis_manager.extend_restriction(
+                interaction.client, self.target_user_id, additional_minutes
             )
+            if new_duration is None:
+                await interaction.response.send_message("❌ This restriction has already ended; apply a new one instead.", ephemeral=True)
+                return
 
-            embed.add_field(name="Extended By", value=interaction.user.display_name, inline=True)
-            embed.add_field(name="Additional Time", value=f"{additional_minutes} minutes", inline=True)
-            embed.add_field(name="New Total Duration", value=f"{new_duration} minutes", inline=True)
-            embed.add_field(name="Reason", value=self.reason.value, inline=False)
+            embed = discord.Embed.from_dict({
+                **_EXTENDED_EMBED,
+                "description": f"Restriction for {self.target_display_name} has been extended",
+                "fields": [
+                    {"name": "Extended By", "value": interaction.user.display_name, "inline": True},
+                    {"name": "Additional Time", "value": f"{additional_minutes} minutes", "inline": True},
+                    {"name": "New Total Duration", "value": f"{new_duration} minutes", "inline": True},
+                    {"name": "Reason", "value": self.reason.value, "inline": False},
+                ]
+            })
 
-            await interaction.followup.send(embed=embed)
+            await interaction.response.send_message(embed=embed)
 
         except Exception as e:
-            await interaction.followup.send(f"❌ Error extending restriction: {str(e)}", ephemeral=True)
\ No newline at end of file
+            # Full detail goes to the log; the moderator gets a short, fixed notice
+            self.psychosis_manager.logger.console_log_system(
+                f"Error extending restriction for user {self.target_user_id}: {e!r}", "ERROR"
+            )
+            await interaction.response.send_message("❌ Error extending restriction. The details have been logged.", ephemeral=True)
\ No newline at end of file